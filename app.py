@@ -1,3 +1,4 @@
+import importlib
 import logging
 from datetime import timedelta
 from flask import Flask, jsonify, request
@@ -8,21 +9,58 @@ from database.db import init_db
 # Extensions
 from extensions import bcrypt, jwt
 
-# Blueprints
-from routes.sensor_routes import sensor_bp
-from routes.batch_routes import batch_bp
-from routes.ai_routes import ai_bp
-from routes.auth_routes import auth_bp
 
-# 🔥 AI SERVICE (Preload models once)
-from services.ai_service import load_models
+# ======================================================
+# 🔥 APP PROFILES (which blueprints a process serves)
+# ======================================================
+# Blueprint modules are imported only when their profile needs them,
+# so an ingest worker never imports the AI stack (numpy/TF/PIL/sklearn).
+
+BLUEPRINTS = (
+    # name, module, blueprint attribute, url prefix
+    ("sensor", "routes.sensor_routes", "sensor_bp", "/api"),
+    ("batch", "routes.batch_routes", "batch_bp", "/api"),
+    ("ai", "routes.ai_routes", "ai_bp", "/api"),
+    ("auth", "routes.auth_routes", "auth_bp", "/api/auth"),
+)
+
+APP_PROFILES = {
+    # ESP32 / gateway ingestion only
+    "ingest": {"blueprints": ("sensor",), "ai": False},
+    # Dashboard API; /finalize-batch answers 503 here, route it to inference
+    "api": {"blueprints": ("sensor", "batch", "auth"), "ai": False},
+    # Model-serving pods (/predict, /finalize-batch)
+    "inference": {"blueprints": ("batch", "ai"), "ai": True},
+    # Single process serving everything (default)
+    "all": {"blueprints": ("sensor", "batch", "ai", "auth"), "ai": True},
+}
+
+
+# All models are cheap to import and needed by every profile
+# (create_all / foreign keys), whatever blueprints get loaded.
+MODEL_MODULES = (
+    "models.user_model",
+    "models.farm_model",
+    "models.batch_model",
+    "models.sensor_model",
+    "models.merkle_model",
+    "models.aggregate_model",
+    "models.pin_model",
+)
+
+
+def register_blueprints(app, profile):
+    for name, module_name, attribute, url_prefix in BLUEPRINTS:
+        if name in profile["blueprints"]:
+            module = importlib.import_module(module_name)
+            app.register_blueprint(getattr(module, attribute), url_prefix=url_prefix)
 
 
 # ======================================================
 # 🔥 CREATE APP FACTORY
 # ======================================================
 
-def create_app():
+def create_app(profile_name=None):
     app = Flask(__name__)
 
     # --------------------------------------------------
@@ -30,6 +68,14 @@ def create_app():
     # --------------------------------------------------
     app.config.from_object(Config)
 
+    profile_name = profile_name or app.config["APP_PROFILE"]
+    if profile_name not in APP_PROFILES:
+        raise ValueError(f"Unknown APP_PROFILE: {profile_name}")
+
+    profile = APP_PROFILES[profile_name]
+    app.config["APP_PROFILE"] = profile_name
+    app.config["AI_ENABLED"] = profile["ai"]
+
     # --------------------------------------------------
     # 🔐 JWT CONFIGURATION
     # --------------------------------------------------
@@ -52,7 +98,7 @@ def create_app():
         format="%(asctime)s - %(levelname)s - %(message)s"
     )
 
-    logging.info("🚀 Starting SpinachChain Backend...")
+    logging.info(f"🚀 Starting SpinachChain Backend (profile: {profile_name})...")
 
     # --------------------------------------------------
     # ✅ GLOBAL CORS CONFIG
@@ -61,6 +107,7 @@ def create_app():
         app,
         resources={r"/api/*": {"origins": "http://localhost:3000"}},
         allow_headers=["Content-Type", "Authorization"],
+        expose_headers=["X-Next-Cursor"],
         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
         supports_credentials=True
     )
@@ -83,6 +130,9 @@ def create_app():
     # Initialize Database
     # --------------------------------------------------
     try:
+        for module_name in MODEL_MODULES:
+            importlib.import_module(module_name)
+
         init_db(app)
         logging.info("✅ Database initialized successfully")
 
@@ -90,29 +140,59 @@ def create_app():
         from database.db import db
         Migrate(app, db)
 
+        # Optional write-behind sensor buffer (SENSOR_WRITE_BEHIND)
+        from services.ingest_buffer import init_ingest_buffer
+        init_ingest_buffer(app)
+
+        # Upcoming sensor_readings partitions (no-op when unpartitioned)
+        if app.config["SENSOR_PARTITION_AUTOCREATE"]:
+            from services.partition_service import ensure_partitions_on_startup
+            with app.app_context():
+                ensure_partitions_on_startup(db.engine, app.config["SENSOR_PARTITION_MONTHS_AHEAD"])
+
     except Exception as e:
         logging.error(f"❌ Database initialization failed: {e}")
         raise e
 
     # --------------------------------------------------
-    # 🔥 PRELOAD AI MODELS (Only Once)
+    # 🔥 LOAD + WARM AI MODELS IN THE BACKGROUND
     # --------------------------------------------------
-    try:
-        load_models()
-        logging.info("✅ AI Models Loaded Successfully")
-    except Exception as e:
-        logging.error(f"❌ AI Model Loading Failed: {e}")
-        raise e
+    # Server accepts (ingest) traffic immediately; AI routes answer
+    # 503 until the models are ready.
+    if profile["ai"]:
+        from services.ai_service import start_background_model_loading
+        start_background_model_loading()
 
     # --------------------------------------------------
-    # Register Blueprints
+    # Register Blueprints (profile only)
     # --------------------------------------------------
-    app.register_blueprint(sensor_bp, url_prefix="/api")
-    app.register_blueprint(batch_bp, url_prefix="/api")
-    app.register_blueprint(ai_bp, url_prefix="/api")
-    app.register_blueprint(auth_bp, url_prefix="/api/auth")
+    register_blueprints(app, profile)
+
+    logging.info(f"✅ Blueprints registered: {', '.join(profile['blueprints'])}")
 
-    logging.info("✅ Blueprints registered")
+    # Retry stored metadata pins where batches get finalized
+    if {"batch", "ai"} & set(profile["blueprints"]):
+        from services.pin_service import init_background_pinner
+        init_background_pinner(app)
+
+    # --------------------------------------------------
+    # CLI Commands (flask <command>)
+    # --------------------------------------------------
+    from commands.rescore import rescore_batches_command
+    from commands.db_checks import check_sensor_indexes_command
+    from commands.partitions import sensor_partitions_cli
+    from commands.pins import retry_pins_command
+    app.cli.add_command(rescore_batches_command)
+    app.cli.add_command(check_sensor_indexes_command)
+    app.cli.add_command(sensor_partitions_cli)
+    app.cli.add_command(retry_pins_command)
+
+    def ai_state():
+        if not app.config["AI_ENABLED"]:
+            return False, {}
+
+        from services.ai_service import models_ready, model_status
+        return models_ready(), model_status()
 
     # --------------------------------------------------
     # Health Check
@@ -122,9 +202,43 @@ def create_app():
         return jsonify({
             "status": "SpinachChain Backend Running",
             "environment": "development",
-            "ai_loaded": True
+            "profile": profile_name,
+            "ai_loaded": ai_state()[0]
         }), 200
 
+    # Liveness: process is up and serving requests
+    @app.route("/health/live")
+    def liveness():
+        return jsonify({"status": "alive"}), 200
+
+    # Readiness: database reachable; ?require=ai also waits for models
+    @app.route("/health/ready")
+    def readiness():
+        from database.db import db
+        from sqlalchemy import text
+
+        checks = {"database": "ok"}
+        ready = True
+
+        try:
+            db.session.execute(text("SELECT 1"))
+        except Exception as e:
+            checks["database"] = f"error: {e}"
+            ready = False
+
+        ai_ready, models = ai_state()
+
+        if request.args.get("require") == "ai" and not ai_ready:
+            ready = False
+
+        return jsonify({
+            "status": "ready" if ready else "not_ready",
+            "profile": profile_name,
+            "checks": checks,
+            "ai_ready": ai_ready,
+            "models": models
+        }), 200 if ready else 503
+
     # --------------------------------------------------
     # JWT Error Handlers
     # --------------------------------------------------
@@ -158,8 +272,12 @@ def create_app():
 # ======================================================
 # 🔥 CREATE APP INSTANCE
 # ======================================================
+# Spawned child processes (inference pool) re-import the script that
+# was run as __mp_main__; under `python app.py` they must not build a
+# second app (DB setup, partition DDL, model loading, their own pools).
 
-app = create_app()
+if __name__ != "__mp_main__":
+    app = create_app()
 
 
 # ======================================================
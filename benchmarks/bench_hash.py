@@ -0,0 +1,53 @@
+"""
+Sensor reading hashing benchmark: json.dumps per reading vs
+hash_sensor_readings() batched fast path.
+
+    python benchmarks/bench_hash.py [count]
+"""
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.hash_utils import hash_sensor_readings  # noqa: E402
+
+
+def legacy_hash(data):
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def main(count):
+    readings = [
+        {
+            "N": random.randint(0, 140),
+            "P": random.randint(5, 145),
+            "K": random.randint(5, 205),
+            "temperature": round(random.uniform(8, 44), 2),
+            "humidity": round(random.uniform(14, 100), 2)
+        }
+        for _ in range(count)
+    ]
+
+    start = time.perf_counter()
+    legacy = [legacy_hash(r) for r in readings]
+    t_legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = hash_sensor_readings(readings)
+    t_batched = time.perf_counter() - start
+
+    assert legacy == batched, "digests differ"
+
+    print(
+        f"{count} readings | json.dumps {t_legacy * 1000:.1f} ms"
+        f" | hash_sensor_readings {t_batched * 1000:.1f} ms"
+        f" | speedup {t_legacy / t_batched:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
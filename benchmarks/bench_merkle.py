@@ -0,0 +1,73 @@
+"""
+Merkle root benchmark: merkletools vs native engine (serial / process pool).
+
+    python benchmarks/bench_merkle.py [sizes...]
+
+merkletools is optional (no longer a dependency); when installed its
+root is also used to check the engine output.
+"""
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import merkle_engine  # noqa: E402
+from services.merkle_engine import build_levels, hex_leaves  # noqa: E402
+
+try:
+    from merkletools import MerkleTools
+except ImportError:
+    MerkleTools = None
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def merkletools_root(hashes):
+    mt = MerkleTools(hash_type="sha256")
+    for h in hashes:
+        mt.add_leaf(h, True)
+    mt.make_tree()
+    return mt.get_merkle_root()
+
+
+def run(size):
+    hashes = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(size)]
+
+    leaves, t_leaves = timed(lambda: hex_leaves(hashes))
+    serial, t_serial = timed(lambda: build_levels(leaves, workers=1)[-1].hex())
+
+    # Force the pool path regardless of size for comparison
+    threshold = merkle_engine.PARALLEL_THRESHOLD
+    merkle_engine.PARALLEL_THRESHOLD = 0
+    try:
+        parallel, t_parallel = timed(lambda: build_levels(leaves)[-1].hex())
+    finally:
+        merkle_engine.PARALLEL_THRESHOLD = threshold
+
+    assert parallel == serial, "parallel root differs from serial root"
+
+    line = (
+        f"{size:>9} leaves | leaf hash {t_leaves * 1000:9.1f} ms"
+        f" | engine serial {t_serial * 1000:9.1f} ms"
+        f" | engine pool {t_parallel * 1000:9.1f} ms"
+    )
+
+    if MerkleTools is not None:
+        reference, t_ref = timed(lambda: merkletools_root(hashes))
+        assert reference == serial, "engine root differs from merkletools"
+        total = t_leaves + t_serial
+        line += f" | merkletools {t_ref * 1000:9.1f} ms | speedup {t_ref / total:5.1f}x"
+
+    print(line)
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in sys.argv[1:]] or [1_000, 100_000, 1_000_000]
+    for size in sizes:
+        run(size)
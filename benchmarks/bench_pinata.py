@@ -0,0 +1,107 @@
+"""
+Pinata upload benchmark against a local stand-in Pinata server:
+bare requests.post per upload vs pooled PinataClient vs AsyncPinataClient.
+
+    python benchmarks/bench_pinata.py [uploads] [failure_rate]
+
+The stand-in answers pinJSONToIPFS / pinFileToIPFS with a fake CID and
+fails `failure_rate` of requests with 503 to exercise retries. Point the
+app at it with PINATA_API_URL=http://127.0.0.1:<port>.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.pinata_client import AsyncPinataClient, PinataClient  # noqa: E402
+
+
+class StandInPinata(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; avoid Nagle/delayed-ACK stalls on keep-alive
+    disable_nagle_algorithm = True
+    failure_rate = 0.0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        if random.random() < self.failure_rate:
+            self._reply(503, {"error": "stand-in failure"})
+            return
+
+        self._reply(200, {"IpfsHash": "Qm" + hashlib.sha256(body).hexdigest()[:44]})
+
+    def _reply(self, status, payload):
+        raw = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stand_in(failure_rate=0.0):
+    StandInPinata.failure_rate = failure_rate
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInPinata)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def main(uploads, failure_rate):
+    server, base_url = start_stand_in(failure_rate)
+    docs = [{"batch_id": f"B{i}", "value": i} for i in range(uploads)]
+
+    def bare(doc):
+        response = requests.post(f"{base_url}/pinning/pinJSONToIPFS", json={"pinataContent": doc}, timeout=20)
+        response.raise_for_status()
+        return response.json()["IpfsHash"]
+
+    StandInPinata.failure_rate = 0.0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(bare, docs))
+    t_bare = time.perf_counter() - start
+
+    StandInPinata.failure_rate = failure_rate
+    client = PinataClient("k", "s", base_url=base_url, pool_size=8, backoff_base=0.01)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(8) as pool:
+        pooled = list(pool.map(client.pin_json, docs))
+    t_pooled = time.perf_counter() - start
+
+    async def run_async():
+        async with AsyncPinataClient("k", "s", base_url=base_url, limit_per_host=8, backoff_base=0.01) as aclient:
+            return await asyncio.gather(*(aclient.pin_json(doc) for doc in docs))
+
+    start = time.perf_counter()
+    async_cids = asyncio.run(run_async())
+    t_async = time.perf_counter() - start
+
+    assert pooled == async_cids
+
+    print(f"uploads={uploads} failure_rate={failure_rate}")
+    print(f"bare requests.post : {t_bare:.3f}s (no failures injected)")
+    print(f"PinataClient       : {t_pooled:.3f}s ({t_bare / t_pooled:.1f}x)")
+    print(f"AsyncPinataClient  : {t_async:.3f}s ({t_bare / t_async:.1f}x)")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    )
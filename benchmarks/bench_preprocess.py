@@ -0,0 +1,83 @@
+"""
+Image preprocessing benchmark: legacy full decode vs draft-mode fast path.
+
+    python benchmarks/bench_preprocess.py [image files...]
+
+Without arguments, synthetic photo-like JPEG/PNG uploads of typical
+sizes are generated in memory. Reports per-image latency and the
+difference from the legacy tensor (0-255 scale).
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from services.image_preprocess import get_input_buffer, image_to_array  # noqa: E402
+
+MEAN_ABS_TOLERANCE = 2.0
+
+SYNTHETIC = (
+    ("12MP JPEG", (4032, 3024), "JPEG"),
+    ("3MP JPEG", (2048, 1536), "JPEG"),
+    ("1080p JPEG", (1920, 1080), "JPEG"),
+    ("1MP PNG", (1280, 800), "PNG"),
+)
+
+
+def legacy_array(data):
+    img = Image.open(io.BytesIO(data)).convert("RGB").resize((224, 224))
+    return np.expand_dims(np.array(img, dtype=np.float32), axis=0)
+
+
+def synthetic_upload(size, fmt):
+    width, height = size
+    rng = np.random.default_rng(42)
+
+    # Smooth colour field + leaf-like blobs + sensor noise
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    r = 90 + 60 * np.sin(x / width * 6.0) * np.cos(y / height * 4.0)
+    g = 140 + 70 * np.cos(x / width * 3.0 + y / height * 5.0)
+    b = 60 + 40 * np.sin((x + y) / (width + height) * 9.0)
+    pixels = np.stack([r, g, b], axis=-1)
+    pixels += rng.normal(0, 6, pixels.shape)
+
+    buffer = io.BytesIO()
+    Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).save(buffer, fmt, quality=92)
+    return buffer.getvalue()
+
+
+def timed(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def run(label, data, repeat=5):
+    legacy, t_legacy = timed(lambda: legacy_array(data), repeat)
+    fast, t_fast = timed(lambda: image_to_array(io.BytesIO(data), out=get_input_buffer()), repeat)
+
+    diff = np.abs(legacy - fast)
+    status = "ok" if diff.mean() <= MEAN_ABS_TOLERANCE else "OUT OF TOLERANCE"
+
+    print(
+        f"{label:<12} | legacy {t_legacy:8.1f} ms | fast {t_fast:7.1f} ms"
+        f" | {t_legacy / t_fast:5.1f}x | mean |diff| {diff.mean():5.2f}"
+        f" | max |diff| {diff.max():6.1f} | {status}"
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            with open(path, "rb") as f:
+                run(os.path.basename(path)[:12], f.read())
+    else:
+        for label, size, fmt in SYNTHETIC:
+            run(label, synthetic_upload(size, fmt))
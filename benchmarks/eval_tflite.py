@@ -0,0 +1,105 @@
+"""
+Compare the TFLite grading backend with the Keras model on held-out images:
+top-1 agreement, per-image latency and resident memory.
+
+    python benchmarks/eval_tflite.py --images path/to/holdout [--quantization int8] [--limit 500]
+
+The images must not be part of TFLITE_CALIBRATION_DIR.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import psutil  # noqa: E402
+import tensorflow as tf  # noqa: E402
+
+from config import Config  # noqa: E402
+from services.ai_service import TOMATO_MODEL_PATH, class_names, load_image_tensor  # noqa: E402
+from services.tflite_backend import IMAGE_EXTENSIONS, load_tflite_classifier, tflite_model_path  # noqa: E402
+
+
+def rss_mb():
+    return psutil.Process().memory_info().rss / 1e6
+
+
+def timed_predict(model, tensor):
+    start = time.perf_counter()
+    output = np.asarray(model.predict_on_batch(tensor))
+    return output.reshape(-1), (time.perf_counter() - start) * 1000
+
+
+def summarize(name, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(f"  {name:<8} median {statistics.median(latencies):7.2f} ms | p95 {p95:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", required=True)
+    parser.add_argument("--quantization", default=Config.TFLITE_QUANTIZATION)
+    parser.add_argument("--limit", type=int, default=500)
+    args = parser.parse_args()
+
+    paths = sorted(
+        os.path.join(args.images, name)
+        for name in os.listdir(args.images)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )[:args.limit]
+
+    if not paths:
+        sys.exit(f"No images found in {args.images}")
+
+    # Load TFLite first so its footprint is not hidden by TF/Keras
+    base = rss_mb()
+    tflite_model = load_tflite_classifier(
+        TOMATO_MODEL_PATH,
+        args.quantization,
+        preprocess=load_image_tensor,
+        calibration_dir=Config.TFLITE_CALIBRATION_DIR,
+        num_threads=Config.TFLITE_NUM_THREADS
+    )
+    tflite_rss = rss_mb() - base
+
+    base = rss_mb()
+    keras_model = tf.keras.models.load_model(TOMATO_MODEL_PATH)
+    keras_rss = rss_mb() - base
+
+    agree = 0
+    keras_latency = []
+    tflite_latency = []
+    max_prob_diff = 0.0
+
+    for path in paths:
+        with open(path, "rb") as f:
+            tensor = load_image_tensor(f)
+
+        keras_out, t_keras = timed_predict(keras_model, tensor)
+        tflite_out, t_tflite = timed_predict(tflite_model, tensor)
+
+        keras_latency.append(t_keras)
+        tflite_latency.append(t_tflite)
+
+        agree += int(np.argmax(keras_out) == np.argmax(tflite_out))
+        max_prob_diff = max(max_prob_diff, float(np.max(np.abs(keras_out - tflite_out))))
+
+    tflite_path = tflite_model_path(TOMATO_MODEL_PATH, args.quantization)
+
+    print(f"Held-out images: {len(paths)} | classes: {', '.join(class_names)}")
+    print(f"Top-1 agreement (TFLite {args.quantization} vs Keras): {agree / len(paths) * 100:.2f}%")
+    print(f"Max |probability difference|: {max_prob_diff:.4f}")
+    print("Latency (batch of 1, first call included):")
+    summarize("keras", keras_latency)
+    summarize("tflite", tflite_latency)
+    print("Memory:")
+    print(f"  keras    file {os.path.getsize(TOMATO_MODEL_PATH) / 1e6:7.1f} MB | RSS +{keras_rss:7.1f} MB")
+    print(f"  tflite   file {os.path.getsize(tflite_path) / 1e6:7.1f} MB | RSS +{tflite_rss:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import re
+from datetime import timedelta
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func, select, text
+from database.db import db
+from models.sensor_model import SensorReading
+from services.sensor_query import batch_reading_filters
+
+
+# =====================================================
+# 🔍 QUERY PLAN CHECK (flask check-sensor-indexes)
+# =====================================================
+#
+# EXPLAINs the per-batch reading queries against the live database and
+# fails (exit 1) if any of them falls back to a sequential scan of
+# sensor_readings. Run after migrations / on a production-sized copy.
+# Monthly partitions are scanned one by one: (nearly) empty ones, e.g.
+# upcoming months, are always seq-scanned and don't count.
+
+SEQ_SCAN = re.compile(r"Seq Scan on (sensor_readings\w*)")
+
+# Seq scans of relations smaller than this are cheaper than an index probe
+MIN_SCANNED_ROWS = 10000
+
+
+def _sample_batch():
+    """
+    Batch with the most readings, plus its created_at span.
+    """
+
+    row = db.session.execute(
+        select(
+            SensorReading.batch_id,
+            func.min(SensorReading.created_at),
+            func.max(SensorReading.created_at)
+        )
+        .group_by(SensorReading.batch_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    ).first()
+
+    return row
+
+
+def _explain(stmt):
+    compiled = stmt.compile(dialect=db.engine.dialect, compile_kwargs={"literal_binds": True})
+    return [line for (line,) in db.session.execute(text(f"EXPLAIN {compiled}"))]
+
+
+def _large_seq_scans(plan):
+    """
+    Relations in the plan seq-scanned despite holding MIN_SCANNED_ROWS+
+    rows, or never analyzed (reltuples = -1: size unknown, stale stats).
+    """
+
+    scanned = {match.group(1) for line in plan for match in SEQ_SCAN.finditer(line)}
+
+    if not scanned:
+        return []
+
+    rows = db.session.execute(
+        text("SELECT relname FROM pg_class WHERE relname = ANY(:names) "
+             "AND (reltuples >= :min_rows OR reltuples < 0)"),
+        {"names": list(scanned), "min_rows": MIN_SCANNED_ROWS}
+    )
+
+    return sorted(name for (name,) in rows)
+
+
+@click.command("check-sensor-indexes")
+@click.option("--batch-pk", type=int, default=None, help="Batch primary key to test with (default: largest batch).")
+@with_appcontext
+def check_sensor_indexes_command(batch_pk):
+    """Verify per-batch sensor queries use ix_sensor_readings_batch_id_created_at."""
+
+    sample = _sample_batch()
+
+    if sample is None:
+        click.echo("No sensor readings yet; nothing to check.")
+        return
+
+    batch_pk = batch_pk or sample[0]
+    start = sample[1]
+    end = sample[2] + timedelta(seconds=1)
+    middle = start + (end - start) / 2
+
+    # Planner statistics must be current for a meaningful plan
+    db.session.execute(text("ANALYZE sensor_readings"))
+
+    queries = {
+        "batch readings (id order)": select(SensorReading.id).where(
+            *batch_reading_filters(batch_pk)
+        ).order_by(SensorReading.id),
+        "batch readings in time range": select(SensorReading.id).where(
+            *batch_reading_filters(batch_pk, middle, end)
+        ),
+        "batch aggregates": select(func.count(SensorReading.id)).where(
+            *batch_reading_filters(batch_pk)
+        )
+    }
+
+    failed = False
+
+    for name, stmt in queries.items():
+        plan = _explain(stmt)
+        seq_scans = _large_seq_scans(plan)
+        failed = failed or bool(seq_scans)
+
+        click.echo(f"{'❌' if seq_scans else '✅'} {name}")
+        for line in plan:
+            click.echo(f"    {line}")
+
+        if seq_scans:
+            click.echo(f"    -> sequential scan of {', '.join(seq_scans)}")
+
+    if failed:
+        raise click.ClickException(
+            "Sequential scan on sensor_readings (index missing or statistics stale?)"
+        )
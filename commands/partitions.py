@@ -0,0 +1,89 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from database.db import db
+from services.partition_service import (
+    apply_retention,
+    ensure_partitions,
+    is_partitioned,
+    list_partitions,
+    retention_plan
+)
+
+
+# =====================================================
+# 🗂️ SENSOR PARTITIONS (flask sensor-partitions ...)
+# =====================================================
+#
+#   list     attached partitions with row estimates
+#   create   partitions for the current + upcoming months
+#   retain   detach (archive) or drop months past the retention window
+#
+# Detached partitions stay as plain tables (sensor_readings_pYYYYMM)
+# for pg_dump / cold storage. Only months whose batches have ended
+# entirely go: a month is held while any of its batches still has
+# readings that stay, so no batch is ever left with part of its readings.
+
+sensor_partitions_cli = AppGroup("sensor-partitions", help="Manage monthly sensor_readings partitions.")
+
+
+def _require_partitioned(conn):
+    if not is_partitioned(conn):
+        raise click.ClickException(
+            "sensor_readings is not partitioned (run `flask db upgrade` first)"
+        )
+
+
+@sensor_partitions_cli.command("list")
+def list_command():
+    """Show attached partitions."""
+
+    with db.engine.connect() as conn:
+        _require_partitioned(conn)
+
+        for name, month, estimate in list_partitions(conn):
+            label = month.strftime("%Y-%m") if month else "default"
+            click.echo(f"{name:<32} {label:<8} ~{estimate} rows")
+
+
+@sensor_partitions_cli.command("create")
+@click.option("--months-ahead", type=int, default=None, help="Months after the current one (default: SENSOR_PARTITION_MONTHS_AHEAD).")
+def create_command(months_ahead):
+    """Create partitions for the current and upcoming months."""
+
+    if months_ahead is None:
+        months_ahead = current_app.config["SENSOR_PARTITION_MONTHS_AHEAD"]
+
+    with db.engine.begin() as conn:
+        _require_partitioned(conn)
+        created = ensure_partitions(conn, months_ahead)
+
+    click.echo(f"Created: {', '.join(created)}" if created else "All partitions already exist.")
+
+
+@sensor_partitions_cli.command("retain")
+@click.option("--keep-months", type=int, default=None, help="Months to keep attached (default: SENSOR_RETENTION_MONTHS).")
+@click.option("--mode", type=click.Choice(["detach", "drop"]), default=None, help="detach = keep as archive table, drop = delete (default: SENSOR_RETENTION_MODE).")
+@click.option("--dry-run", is_flag=True, help="Only list the partitions that would be affected.")
+def retain_command(keep_months, mode, dry_run):
+    """Detach or drop partitions older than the retention window (whole batches only)."""
+
+    keep_months = keep_months if keep_months is not None else current_app.config["SENSOR_RETENTION_MONTHS"]
+    mode = mode or current_app.config["SENSOR_RETENTION_MODE"]
+
+    if keep_months <= 0:
+        raise click.ClickException("Retention disabled (set --keep-months or SENSOR_RETENTION_MONTHS)")
+
+    with db.engine.begin() as conn:
+        _require_partitioned(conn)
+
+        if dry_run:
+            names, held = retention_plan(conn, keep_months)
+            click.echo(f"Would {mode}: {', '.join(names)}" if names else "Nothing to do.")
+        else:
+            names, held = apply_retention(conn, keep_months, mode)
+            done = "Detached" if mode == "detach" else "Dropped"
+            click.echo(f"{done}: {', '.join(names)}" if names else "Nothing to do.")
+
+    if held:
+        click.echo(f"Held (batches continue into kept months): {', '.join(held)}")
@@ -0,0 +1,47 @@
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import select
+from database.db import db
+from models.batch_model import SpinachBatch
+from models.pin_model import PendingMetadataPin
+from services.pin_service import PIN_FAILED, PIN_PENDING, claim_due_pins, pin_now
+
+
+# =====================================================
+# 📌 METADATA PIN RETRIES (flask retry-pins)
+# =====================================================
+#
+# Same work as the in-app sweeper, run synchronously (cron / after an
+# outage): pins stored metadata bytes that are due (or all of them with
+# --all) and checks each against its CID.
+
+@click.command("retry-pins")
+@click.option("--all", "include_not_due", is_flag=True, help="Retry every stored pin, not only the due ones.")
+@click.option("--limit", type=int, default=100, show_default=True, help="Pins to retry in this run.")
+@with_appcontext
+def retry_pins_command(include_not_due, limit):
+    """Re-pin pending / failed batch metadata to Pinata."""
+
+    claimed = claim_due_pins(limit=limit, include_not_due=include_not_due)
+
+    failed = 0
+    for batch_pk, pin in claimed:
+        error = pin_now(batch_pk, pin)
+        failed += error is not None
+        click.echo(f"{'❌' if error else '✅'} batch pk={batch_pk} {pin.cid}{f': {error}' if error else ''}")
+
+    click.echo(f"Retried {len(claimed)} pin(s), {failed} failed.")
+
+    # Pending / failed before metadata bytes were stored: nothing to re-pin
+    orphaned = db.session.scalars(
+        select(SpinachBatch.batch_id)
+        .outerjoin(PendingMetadataPin, PendingMetadataPin.batch_id == SpinachBatch.id)
+        .where(SpinachBatch.pin_status.in_((PIN_PENDING, PIN_FAILED)))
+        .where(PendingMetadataPin.batch_id.is_(None))
+    ).all()
+
+    if orphaned:
+        click.echo(f"⚠️ No stored metadata for {len(orphaned)} batch(es), finalize again: {', '.join(orphaned)}")
+
+    if failed:
+        raise click.ClickException(f"{failed} pin(s) failed; they stay queued for the next retry")
@@ -0,0 +1,156 @@
+import time
+from datetime import datetime
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func, select, update
+from database.db import db
+from models.aggregate_model import BatchSensorAggregate
+from models.batch_model import SpinachBatch
+from models.sensor_model import SensorReading
+
+
+# =====================================================
+# 🔥 OFFLINE RE-SCORING (flask rescore-batches)
+# =====================================================
+#
+# After changing the fusion weights or retraining env_model / anomaly_model,
+# re-score every analyzed batch: features come from the running sensor
+# aggregates, the models run once per chunk on a whole matrix, and results
+# go back with one executemany UPDATE per chunk. disease_probability is
+# the stored image result (images are not re-graded).
+
+SUM_COLUMNS = ("sum_nitrogen", "sum_phosphorus", "sum_potassium", "sum_temperature", "sum_humidity")
+
+
+def _fetch_chunk(last_id, chunk_size):
+    stmt = (
+        select(
+            SpinachBatch.id,
+            SpinachBatch.disease_probability,
+            BatchSensorAggregate.reading_count,
+            *[getattr(BatchSensorAggregate, column) for column in SUM_COLUMNS]
+        )
+        .outerjoin(BatchSensorAggregate, BatchSensorAggregate.batch_id == SpinachBatch.id)
+        .where(SpinachBatch.id > last_id, SpinachBatch.disease_probability.isnot(None))
+        .order_by(SpinachBatch.id)
+        .limit(chunk_size)
+    )
+
+    return [list(row) for row in db.session.execute(stmt)]
+
+
+def _fill_missing_aggregates(rows):
+    """
+    Legacy batches without an aggregates row: sum their readings in one
+    grouped query for the whole chunk.
+    """
+
+    missing = {row[0]: row for row in rows if row[2] is None}
+
+    if not missing:
+        return
+
+    stmt = (
+        select(
+            SensorReading.batch_id,
+            func.count(SensorReading.id),
+            func.sum(SensorReading.nitrogen),
+            func.sum(SensorReading.phosphorus),
+            func.sum(SensorReading.potassium),
+            func.sum(SensorReading.temperature),
+            func.sum(SensorReading.humidity)
+        )
+        .where(SensorReading.batch_id.in_(missing))
+        .group_by(SensorReading.batch_id)
+    )
+
+    for batch_pk, count, *sums in db.session.execute(stmt):
+        missing[batch_pk][2:] = [count, *sums]
+
+    for row in missing.values():
+        if row[2] is None:
+            row[2:] = [0] + [0.0] * len(SUM_COLUMNS)
+
+
+def score_chunk(rows):
+    """
+    Update parameter dicts (one per batch) for a fetched chunk.
+    """
+
+    import numpy as np
+    from services.ai_service import (
+        build_feature_matrix,
+        calculate_health_scores,
+        score_environment_batch
+    )
+
+    data = np.array([row[1:] for row in rows], dtype=np.float64)
+
+    disease_prob = data[:, 0]
+    counts = data[:, 1]
+    has_readings = counts > 0
+
+    env_risk = np.zeros(len(rows))
+    anomaly_detected = np.zeros(len(rows), dtype=bool)
+
+    # Same as predict_environment: no readings -> (0.0, False)
+    if has_readings.any():
+        means = data[has_readings, 2:] / counts[has_readings, None]
+        features = build_feature_matrix(*means.T)
+
+        env_risk[has_readings], anomaly_detected[has_readings] = score_environment_batch(features)
+
+    health_score = calculate_health_scores(disease_prob, env_risk, anomaly_detected)
+    now = datetime.utcnow()
+
+    return [
+        {
+            "id": row[0],
+            "environmental_risk": float(env_risk[i]),
+            "anomaly_detected": bool(anomaly_detected[i]),
+            "health_score": float(health_score[i]),
+            "updated_at": now
+        }
+        for i, row in enumerate(rows)
+    ]
+
+
+@click.command("rescore-batches")
+@click.option("--chunk-size", default=5000, show_default=True, help="Batches per query / model call / UPDATE.")
+@click.option("--dry-run", is_flag=True, help="Score but do not write anything.")
+@with_appcontext
+def rescore_batches_command(chunk_size, dry_run):
+    """Re-score environmental risk, anomaly and health for all analyzed batches."""
+
+    from services.ai_service import ENV_MODEL_NAMES, load_models
+
+    load_models(ENV_MODEL_NAMES)
+
+    started = time.perf_counter()
+    last_id = 0
+    total = 0
+
+    while True:
+        rows = _fetch_chunk(last_id, chunk_size)
+
+        if not rows:
+            break
+
+        _fill_missing_aggregates(rows)
+        params = score_chunk(rows)
+
+        if not dry_run:
+            db.session.execute(update(SpinachBatch), params)
+            db.session.commit()
+        else:
+            db.session.rollback()
+
+        last_id = rows[-1][0]
+        total += len(rows)
+
+        click.echo(f"  rescored {total} batches (last id {last_id})")
+
+    elapsed = time.perf_counter() - started
+    action = "Scored (dry run)" if dry_run else "Rescored"
+
+    click.echo(f"✅ {action} {total} batches in {elapsed:.1f}s")
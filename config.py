@@ -16,9 +16,47 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # 🔹 Connection Pool (per process; statement timeout 0 = none)
+    # Migrations and CLI jobs share these options, so keep the timeout
+    # above the longest migration / batch job when setting one.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+        "connect_args": (
+            {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+            if DB_STATEMENT_TIMEOUT_MS > 0 else {}
+        )
+    }
+
     # 🔹 IPFS (Pinata)
     PINATA_API_KEY = os.getenv("PINATA_API_KEY")
     PINATA_SECRET_KEY = os.getenv("PINATA_SECRET_KEY")
+    PINATA_API_URL = os.getenv("PINATA_API_URL", "https://api.pinata.cloud")
+    PINATA_POOL_SIZE = int(os.getenv("PINATA_POOL_SIZE", "10"))
+    PINATA_MAX_RETRIES = int(os.getenv("PINATA_MAX_RETRIES", "3"))
+    PINATA_BACKOFF_BASE = float(os.getenv("PINATA_BACKOFF_BASE", "0.5"))
+    PINATA_BACKOFF_MAX = float(os.getenv("PINATA_BACKOFF_MAX", "8"))
+    PINATA_CONNECT_TIMEOUT = float(os.getenv("PINATA_CONNECT_TIMEOUT", "3.05"))
+    PINATA_READ_TIMEOUT = float(os.getenv("PINATA_READ_TIMEOUT", "20"))
+
+    # 🔹 Metadata CID computed locally, pinned in the background
+    IPFS_LOCAL_CID = os.getenv("IPFS_LOCAL_CID", "True") == "True"
+    IPFS_PIN_WORKERS = int(os.getenv("IPFS_PIN_WORKERS", "2"))
+    # Failed / interrupted pins: retried every INTERVAL * 2^attempts up to MAX_DELAY seconds (0 = no sweeper)
+    IPFS_PIN_RETRY_INTERVAL = int(os.getenv("IPFS_PIN_RETRY_INTERVAL", "60"))
+    IPFS_PIN_RETRY_MAX_DELAY = int(os.getenv("IPFS_PIN_RETRY_MAX_DELAY", "3600"))
+
+    # 🔹 metadata["sensor_readings"] format: "json" (list of dicts) or "columnar"
+    IPFS_SENSOR_ENCODING = os.getenv("IPFS_SENSOR_ENCODING", "json")
 
     # 🔹 Blockchain
     SEPOLIA_RPC_URL = os.getenv("SEPOLIA_RPC_URL")
@@ -26,4 +64,62 @@ class Config:
     CONTRACT_ADDRESS = os.getenv("CONTRACT_ADDRESS")
 
     # 🔹 Ethereum Network
-    SEPOLIA_CHAIN_ID = 11155111
\ No newline at end of file
+    SEPOLIA_CHAIN_ID = 11155111
+
+    # 🔹 Sensor Ingestion
+    SENSOR_BULK_MAX_READINGS = int(os.getenv("SENSOR_BULK_MAX_READINGS", "1000"))
+
+    # 🔹 Chart series: buckets above this are LTTB-downsampled (0 = never)
+    SENSOR_SERIES_MAX_POINTS = int(os.getenv("SENSOR_SERIES_MAX_POINTS", "500"))
+
+    # 🔹 sensor_readings monthly partitions (created ahead at startup; retention 0 = keep all)
+    SENSOR_PARTITION_AUTOCREATE = os.getenv("SENSOR_PARTITION_AUTOCREATE", "True") == "True"
+    SENSOR_PARTITION_MONTHS_AHEAD = int(os.getenv("SENSOR_PARTITION_MONTHS_AHEAD", "3"))
+    SENSOR_RETENTION_MONTHS = int(os.getenv("SENSOR_RETENTION_MONTHS", "0"))
+    SENSOR_RETENTION_MODE = os.getenv("SENSOR_RETENTION_MODE", "detach")
+
+    # 🔹 GET /api/batches page size (keyset pagination)
+    BATCH_PAGE_SIZE = int(os.getenv("BATCH_PAGE_SIZE", "100"))
+    BATCH_PAGE_MAX = int(os.getenv("BATCH_PAGE_MAX", "1000"))
+
+    # 🔹 Batch ID Resolution Cache (per process)
+    BATCH_CACHE_SIZE = int(os.getenv("BATCH_CACHE_SIZE", "10000"))
+    BATCH_CACHE_TTL = int(os.getenv("BATCH_CACHE_TTL", "300"))
+
+    # 🔹 Write-Behind Sensor Ingestion (202 + background flush)
+    SENSOR_WRITE_BEHIND = os.getenv("SENSOR_WRITE_BEHIND", "False") == "True"
+    SENSOR_BUFFER_MAX_ROWS = int(os.getenv("SENSOR_BUFFER_MAX_ROWS", "10000"))
+    SENSOR_FLUSH_ROWS = int(os.getenv("SENSOR_FLUSH_ROWS", "500"))
+    SENSOR_FLUSH_INTERVAL_MS = int(os.getenv("SENSOR_FLUSH_INTERVAL_MS", "200"))
+
+    # 🔹 AI Inference Micro-Batching
+    INFERENCE_BATCHING = os.getenv("INFERENCE_BATCHING", "True") == "True"
+    INFERENCE_MAX_BATCH = int(os.getenv("INFERENCE_MAX_BATCH", "16"))
+    INFERENCE_MAX_WAIT_MS = int(os.getenv("INFERENCE_MAX_WAIT_MS", "5"))
+
+    # 🔹 Inference processes holding the models (0 = run in the web worker)
+    INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "0"))
+    INFERENCE_TIMEOUT = float(os.getenv("INFERENCE_TIMEOUT", "30"))  # seconds per call (pool or batcher), 0 = wait forever
+
+    # 🔹 Failed model loads: retry after BASE, 2*BASE, ... up to MAX seconds
+    AI_LOAD_RETRY_BASE = float(os.getenv("AI_LOAD_RETRY_BASE", "15"))
+    AI_LOAD_RETRY_MAX = float(os.getenv("AI_LOAD_RETRY_MAX", "600"))
+
+    # 🔹 Grading Model Backend ("keras" or "tflite")
+    AI_BACKEND = os.getenv("AI_BACKEND", "keras")
+    TFLITE_QUANTIZATION = os.getenv("TFLITE_QUANTIZATION", "float16")
+    TFLITE_CALIBRATION_DIR = os.getenv("TFLITE_CALIBRATION_DIR")
+    TFLITE_NUM_THREADS = int(os.getenv("TFLITE_NUM_THREADS", "0")) or None
+
+    # 🔹 App Profile: ingest | api | inference | all
+    APP_PROFILE = os.getenv("APP_PROFILE", "all")
+
+    # 🔹 Image Preprocessing (JPEG draft-mode reduced decode)
+    IMAGE_FAST_DECODE = os.getenv("IMAGE_FAST_DECODE", "True") == "True"
+
+    # 🔹 AI Inference Result Cache (0 disables; optional disk tier)
+    INFERENCE_CACHE_SIZE = int(os.getenv("INFERENCE_CACHE_SIZE", "1024"))
+    INFERENCE_CACHE_DIR = os.getenv("INFERENCE_CACHE_DIR")
+    INFERENCE_CACHE_DISK_MAX_ENTRIES = int(os.getenv("INFERENCE_CACHE_DISK_MAX_ENTRIES", "10000"))
+    INFERENCE_CACHE_DISK_TTL = int(os.getenv("INFERENCE_CACHE_DISK_TTL", "604800"))  # seconds, 0 = no expiry
+    MODEL_VERSION = os.getenv("MODEL_VERSION")
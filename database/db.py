@@ -1,7 +1,8 @@
 import os
+import threading
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 from dotenv import load_dotenv
 
 # 🔹 Load environment variables from .env
@@ -34,30 +35,80 @@ def init_db(app):
     with app.app_context():
         db.create_all()
 
+        # Background sessions share the app's engine (one pool per process)
+        bind_session_factory(db.engine)
+
     print("✅ Database initialized successfully")
 
 
 # -------------------------------------------------------------------
 # 🔹 Optional Manual Session (Advanced Queries / Background Jobs)
 # -------------------------------------------------------------------
+# One engine (and pool) per process: init_db binds SessionLocal to the
+# app's db.engine (built from app.config["SQLALCHEMY_ENGINE_OPTIONS"]).
+# Scripts that never create an app get a standalone engine with the
+# Config defaults on first use. Sessions are scoped per thread: call
+# SessionLocal.remove() when a job/thread is done.
+
+_engine = None
+_engine_lock = threading.Lock()
+
+SessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False))
+
+
+def bind_session_factory(engine):
+    global _engine
+
+    with _engine_lock:
+        _engine = engine
+        SessionLocal.remove()
+        SessionLocal.configure(bind=engine)
+
 
 def get_engine():
     """
-    Create engine safely when needed
-    (Avoid global engine to prevent startup crash)
+    Process-wide engine (the app's db.engine once init_db has run)
     """
-    return create_engine(DATABASE_URL, pool_pre_ping=True)
+
+    global _engine
+
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                from config import Config
+
+                _engine = create_engine(DATABASE_URL, **Config.SQLALCHEMY_ENGINE_OPTIONS)
+                SessionLocal.configure(bind=_engine)
+
+    return _engine
 
 
 def get_db_session():
     """
-    Create new SQLAlchemy session manually
+    This thread's session on the shared engine
     (Use only if needed)
     """
-    engine = get_engine()
-    SessionLocal = sessionmaker(
-        autocommit=False,
-        autoflush=False,
-        bind=engine
-    )
-    return SessionLocal()
\ No newline at end of file
+    get_engine()
+    return SessionLocal()
+
+
+# -------------------------------------------------------------------
+# 🔹 Fork safety (gunicorn --preload, multiprocessing "fork")
+# -------------------------------------------------------------------
+# A forked child must never reuse the parent's sockets. Drop the
+# inherited pools without closing them (close=False leaves the parent's
+# connections alone) so the child opens its own.
+
+def _reset_pools_after_fork():
+    global _engine_lock
+
+    _engine_lock = threading.Lock()
+    SessionLocal.registry.clear()
+
+    # Since init_db this is also the app's db.engine
+    if _engine is not None:
+        _engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
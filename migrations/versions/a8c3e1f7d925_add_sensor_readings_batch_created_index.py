@@ -0,0 +1,40 @@
+"""add sensor readings batch_id created_at index
+
+Revision ID: a8c3e1f7d925
+Revises: f2b6d8e4a3c1
+Create Date: 2026-10-17 20:34:52.661094
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8c3e1f7d925'
+down_revision = 'f2b6d8e4a3c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY keeps ingestion writing while the index builds
+    # (must run outside the migration transaction)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_sensor_readings_batch_id_created_at',
+            'sensor_readings',
+            ['batch_id', 'created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_sensor_readings_batch_id_created_at',
+            table_name='sensor_readings',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
@@ -0,0 +1,118 @@
+"""partition sensor_readings by month on created_at
+
+Revision ID: b3d9f5a1c7e2
+Revises: a8c3e1f7d925
+Create Date: 2026-10-17 22:05:13.418207
+
+"""
+from datetime import date, datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3d9f5a1c7e2'
+down_revision = 'a8c3e1f7d925'
+branch_labels = None
+depends_on = None
+
+
+# Partitions from the oldest reading's month through this many months
+# past the current one; the app keeps creating them ahead after that.
+MONTHS_AHEAD = 3
+
+INDEX = 'ix_sensor_readings_batch_id_created_at'
+
+
+def _add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _is_partitioned(conn):
+    return conn.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = 'sensor_readings' AND pg_table_is_visible(c.oid))"
+    )).scalar()
+
+
+def upgrade():
+    # Rewrites the table: sensor_readings is locked (ACCESS EXCLUSIVE)
+    # while rows are copied, so run it in a maintenance window.
+    conn = op.get_bind()
+
+    if _is_partitioned(conn):
+        return
+
+    # 1) Move the current table out of the way (names must be free)
+    op.execute("ALTER TABLE sensor_readings RENAME TO sensor_readings_legacy")
+    op.execute("ALTER TABLE sensor_readings_legacy RENAME CONSTRAINT sensor_readings_pkey TO sensor_readings_legacy_pkey")
+    op.execute(f"ALTER INDEX IF EXISTS {INDEX} RENAME TO ix_sensor_readings_legacy_batch_id_created_at")
+
+    # 2) Partitioned parent; the partition key must be part of the PK
+    op.execute(
+        "CREATE TABLE sensor_readings "
+        "(LIKE sensor_readings_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.execute("ALTER TABLE sensor_readings ADD CONSTRAINT sensor_readings_pkey PRIMARY KEY (id, created_at)")
+    op.execute(
+        "ALTER TABLE sensor_readings ADD CONSTRAINT sensor_readings_batch_id_fkey "
+        "FOREIGN KEY (batch_id) REFERENCES spinach_batches (id) ON DELETE CASCADE"
+    )
+    op.execute(f"CREATE INDEX {INDEX} ON sensor_readings (batch_id, created_at)")
+
+    # id keeps drawing from the same sequence; it must survive the old table
+    op.execute("ALTER SEQUENCE sensor_readings_id_seq OWNED BY sensor_readings.id")
+
+    # 3) Monthly partitions + a default for anything out of range
+    oldest = conn.execute(sa.text("SELECT min(created_at) FROM sensor_readings_legacy")).scalar()
+    now = datetime.utcnow()
+
+    month = date((oldest or now).year, (oldest or now).month, 1)
+    last = _add_months(date(now.year, now.month, 1), MONTHS_AHEAD)
+
+    while month <= last:
+        following = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE sensor_readings_p{month:%Y%m} PARTITION OF sensor_readings "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        month = following
+
+    op.execute("CREATE TABLE sensor_readings_default PARTITION OF sensor_readings DEFAULT")
+
+    # 4) Copy rows, drop the old table
+    op.execute("INSERT INTO sensor_readings SELECT * FROM sensor_readings_legacy")
+    op.execute("DROP TABLE sensor_readings_legacy")
+    op.execute("ANALYZE sensor_readings")
+
+
+def downgrade():
+    # Only attached partitions come back; detached (archived) ones are
+    # left as standalone tables.
+    conn = op.get_bind()
+
+    if not _is_partitioned(conn):
+        return
+
+    op.execute("ALTER TABLE sensor_readings RENAME TO sensor_readings_partitioned")
+    op.execute("ALTER TABLE sensor_readings_partitioned RENAME CONSTRAINT sensor_readings_pkey TO sensor_readings_partitioned_pkey")
+    op.execute(f"ALTER INDEX {INDEX} RENAME TO ix_sensor_readings_partitioned_batch_id_created_at")
+
+    op.execute(
+        "CREATE TABLE sensor_readings "
+        "(LIKE sensor_readings_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    op.execute("ALTER TABLE sensor_readings ADD CONSTRAINT sensor_readings_pkey PRIMARY KEY (id)")
+    op.execute(
+        "ALTER TABLE sensor_readings ADD CONSTRAINT sensor_readings_batch_id_fkey "
+        "FOREIGN KEY (batch_id) REFERENCES spinach_batches (id) ON DELETE CASCADE"
+    )
+    op.execute("ALTER SEQUENCE sensor_readings_id_seq OWNED BY sensor_readings.id")
+
+    op.execute("INSERT INTO sensor_readings SELECT * FROM sensor_readings_partitioned")
+    op.execute(f"CREATE INDEX {INDEX} ON sensor_readings (batch_id, created_at)")
+
+    op.execute("DROP TABLE sensor_readings_partitioned CASCADE")
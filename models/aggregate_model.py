@@ -0,0 +1,60 @@
+from database.db import db
+from datetime import datetime
+
+
+class BatchSensorAggregate(db.Model):
+    __tablename__ = "batch_sensor_aggregates"
+
+    # -------------------------------------------------
+    # 🔹 One row per batch (integer FK = PK)
+    # -------------------------------------------------
+    batch_id = db.Column(
+        db.Integer,
+        db.ForeignKey("spinach_batches.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    # -------------------------------------------------
+    # 🔹 Running totals (kept current at ingest)
+    # -------------------------------------------------
+    reading_count = db.Column(db.Integer, nullable=False, default=0)
+
+    sum_nitrogen = db.Column(db.Float, nullable=False, default=0.0)
+    sum_phosphorus = db.Column(db.Float, nullable=False, default=0.0)
+    sum_potassium = db.Column(db.Float, nullable=False, default=0.0)
+    sum_temperature = db.Column(db.Float, nullable=False, default=0.0)
+    sum_humidity = db.Column(db.Float, nullable=False, default=0.0)
+
+    updated_at = db.Column(
+        db.DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow
+    )
+
+    # -------------------------------------------------
+    # 🔹 Helpers
+    # -------------------------------------------------
+    def add_rows(self, rows):
+        self.reading_count = (self.reading_count or 0) + len(rows)
+        self.sum_nitrogen = (self.sum_nitrogen or 0.0) + sum(r["nitrogen"] for r in rows)
+        self.sum_phosphorus = (self.sum_phosphorus or 0.0) + sum(r["phosphorus"] for r in rows)
+        self.sum_potassium = (self.sum_potassium or 0.0) + sum(r["potassium"] for r in rows)
+        self.sum_temperature = (self.sum_temperature or 0.0) + sum(r["temperature"] for r in rows)
+        self.sum_humidity = (self.sum_humidity or 0.0) + sum(r["humidity"] for r in rows)
+
+    def means(self):
+        if not self.reading_count:
+            return None
+
+        count = float(self.reading_count)
+
+        return {
+            "nitrogen": self.sum_nitrogen / count,
+            "phosphorus": self.sum_phosphorus / count,
+            "potassium": self.sum_potassium / count,
+            "temperature": self.sum_temperature / count,
+            "humidity": self.sum_humidity / count
+        }
+
+    def __repr__(self):
+        return f"<BatchSensorAggregate BatchID={self.batch_id} Count={self.reading_count}>"
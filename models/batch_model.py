@@ -2,9 +2,49 @@ from database.db import db
 from datetime import datetime
 
 
+def _float_or_zero(value):
+    return float(value) if value is not None else 0
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+# 🔹 API field -> JSON conversion (to_dict + ?fields= projections)
+BATCH_FIELD_SERIALIZERS = {
+    "batch_id": lambda value: value,
+    "ipfs_cid": lambda value: value,
+    "pin_status": lambda value: value,
+    "merkle_root": lambda value: value,
+    "blockchain_tx_hash": lambda value: value,
+    "harvest_timestamp": _isoformat,
+
+    # AI Fields (Safe JSON Conversion)
+    "environmental_risk": _float_or_zero,
+    "disease_probability": _float_or_zero,
+    "health_score": _float_or_zero,
+    "anomaly_detected": lambda value: bool(value) if value is not None else False,
+    "disease_class": lambda value: value if value else None,
+    "predicted_yield": _float_or_zero
+}
+
+# Extra columns clients may request with ?fields=
+BATCH_PROJECTION_EXTRAS = {
+    "farm_id": lambda value: value,
+    "created_at": _isoformat
+}
+
+
 class SpinachBatch(db.Model):
     __tablename__ = "spinach_batches"
 
+    # 🔹 Keyset pagination (created_at DESC, id DESC) + filtered listings
+    __table_args__ = (
+        db.Index("ix_spinach_batches_created_at_id", "created_at", "id"),
+        db.Index("ix_spinach_batches_farm_id_created_at_id", "farm_id", "created_at", "id"),
+        db.Index("ix_spinach_batches_disease_class_created_at_id", "disease_class", "created_at", "id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
 
     # 🔹 Unique Batch Identifier (Same as Blockchain ID)
@@ -12,6 +52,8 @@ class SpinachBatch(db.Model):
 
     # 🔹 Off-chain Integrity Data
     ipfs_cid = db.Column(db.String(255), nullable=True)
+    # pending / pinned / reconciled / failed (CID computed locally, pinned in background)
+    pin_status = db.Column(db.String(20), nullable=True)
     merkle_root = db.Column(db.String(66), nullable=True)
 
     # 🔹 Optional: Store blockchain tx hash for reference
@@ -51,19 +93,8 @@ class SpinachBatch(db.Model):
 
     def to_dict(self):
         return {
-            "batch_id": self.batch_id,
-            "ipfs_cid": self.ipfs_cid,
-            "merkle_root": self.merkle_root,
-            "blockchain_tx_hash": self.blockchain_tx_hash,
-            "harvest_timestamp": self.harvest_timestamp.isoformat() if self.harvest_timestamp else None,
-
-            # AI Fields (Safe JSON Conversion)
-            "environmental_risk": float(self.environmental_risk) if self.environmental_risk is not None else 0,
-            "disease_probability": float(self.disease_probability) if self.disease_probability is not None else 0,
-            "health_score": float(self.health_score) if self.health_score is not None else 0,
-            "anomaly_detected": bool(self.anomaly_detected) if self.anomaly_detected is not None else False,
-            "disease_class": self.disease_class if self.disease_class else None,
-            "predicted_yield": float(self.predicted_yield) if self.predicted_yield is not None else 0
+            field: serialize(getattr(self, field))
+            for field, serialize in BATCH_FIELD_SERIALIZERS.items()
         }
 
     def __repr__(self):
@@ -0,0 +1,67 @@
+from database.db import db
+from datetime import datetime
+
+
+class BatchMerkleFrontier(db.Model):
+    __tablename__ = "batch_merkle_frontiers"
+
+    # -------------------------------------------------
+    # 🔹 One row per batch (integer FK = PK)
+    # -------------------------------------------------
+    batch_id = db.Column(
+        db.Integer,
+        db.ForeignKey("spinach_batches.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    # -------------------------------------------------
+    # 🔹 Append-only accumulator state
+    # -------------------------------------------------
+    # Number of leaves appended so far (== sensor readings)
+    leaf_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # Right-edge frontier: packed 32-byte subtree roots, largest
+    # subtree first. Subtree sizes are the set bits of leaf_count.
+    frontier = db.Column(db.LargeBinary, nullable=False, default=b"")
+
+    updated_at = db.Column(
+        db.DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow
+    )
+
+    def __repr__(self):
+        return f"<BatchMerkleFrontier BatchID={self.batch_id} Leaves={self.leaf_count}>"
+
+
+class BatchMerkleTree(db.Model):
+    __tablename__ = "batch_merkle_trees"
+
+    # -------------------------------------------------
+    # 🔹 One cached tree per batch (integer FK = PK)
+    # -------------------------------------------------
+    batch_id = db.Column(
+        db.Integer,
+        db.ForeignKey("spinach_batches.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    # -------------------------------------------------
+    # 🔹 Tree snapshot
+    # -------------------------------------------------
+    # Leaf count the snapshot was built from (stale when readings grow)
+    leaf_count = db.Column(db.Integer, nullable=False)
+    merkle_root = db.Column(db.String(66), nullable=False)
+
+    # Every level packed as 32-byte hashes, leaves first, root last.
+    # Level sizes follow from leaf_count (n, ceil(n/2), ..., 1).
+    levels = db.Column(db.LargeBinary, nullable=False)
+
+    created_at = db.Column(
+        db.DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow
+    )
+
+    def __repr__(self):
+        return f"<BatchMerkleTree BatchID={self.batch_id} Leaves={self.leaf_count}>"
@@ -0,0 +1,39 @@
+from database.db import db
+from datetime import datetime
+
+
+class PendingMetadataPin(db.Model):
+    __tablename__ = "pending_metadata_pins"
+
+    # -------------------------------------------------
+    # 🔹 One outstanding pin per batch (integer FK = PK)
+    # -------------------------------------------------
+    batch_id = db.Column(
+        db.Integer,
+        db.ForeignKey("spinach_batches.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    # -------------------------------------------------
+    # 🔹 Exact bytes behind the advertised CID
+    # -------------------------------------------------
+    # Saved in the same transaction as batch.ipfs_cid, deleted once
+    # Pinata has them, so a restart never loses what the CID points to
+    cid = db.Column(db.String(255), nullable=False)
+    name = db.Column(db.String(255), nullable=False)
+    data = db.Column(db.LargeBinary, nullable=False)
+
+    # -------------------------------------------------
+    # 🔹 Retry state
+    # -------------------------------------------------
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    created_at = db.Column(
+        db.DateTime,
+        default=datetime.utcnow
+    )
+
+    def __repr__(self):
+        return f"<PendingMetadataPin BatchID={self.batch_id} CID={self.cid} Attempts={self.attempts}>"
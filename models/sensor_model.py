@@ -5,6 +5,11 @@ from datetime import datetime
 class SensorReading(db.Model):
     __tablename__ = "sensor_readings"
 
+    # 🔹 Per-batch fetches + created_at ranges (FK alone is not indexed)
+    __table_args__ = (
+        db.Index("ix_sensor_readings_batch_id_created_at", "batch_id", "created_at"),
+    )
+
     # -------------------------------------------------
     # 🔹 Primary Key
     # -------------------------------------------------
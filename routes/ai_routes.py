@@ -1,11 +1,13 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from database.db import db
-from models.batch_model import SpinachBatch
-from models.sensor_model import SensorReading
 from services.ai_service import run_ai_analysis, generate_metadata
-from services.ipfs_service import upload_json_to_ipfs
-from services.merkle_service import generate_merkle_root
+from services.aggregate_service import get_batch_aggregates
+from services.batch_cache import get_batch_or_none
+from services.merkle_service import load_readings_with_root, save_batch_tree
+from services.pin_service import prepare_metadata_pin, save_pending_pin, schedule_pin
+from utils.ai_readiness import require_ai_models
+from utils.sensor_codec import pack_sensor_readings
 
 ai_bp = Blueprint("ai_bp", __name__)
 
@@ -15,26 +17,30 @@ ai_bp = Blueprint("ai_bp", __name__)
 # ======================================================
 @ai_bp.route("/predict/<batch_id>", methods=["POST"])
 @jwt_required()
+@require_ai_models
 def predict_batch(batch_id):
 
     try:
         current_user = get_jwt_identity()
 
         # --------------------------------------------------
-        # 🔹 Fetch Batch (business ID)
+        # 🔹 Fetch Batch (business ID -> cached PK)
         # --------------------------------------------------
-        batch = SpinachBatch.query.filter_by(batch_id=batch_id).first()
+        batch = get_batch_or_none(batch_id)
         if not batch:
             return jsonify({"error": "Batch not found"}), 404
 
         # --------------------------------------------------
-        # 🔹 Fetch Sensor Data (integer FK)
+        # 🔹 Fetch Sensor Data + Merkle root (frontier snapshot)
         # --------------------------------------------------
-        readings = SensorReading.query.filter_by(batch_id=batch.id).all()
+        # Root of exactly these readings (later ingests must not change
+        # what gets stored, pinned and cached alongside them)
+        readings, merkle_root = load_readings_with_root(batch.id)
         if not readings:
             return jsonify({"error": "No sensor data found"}), 404
 
         sensor_data = [r.to_dict() for r in readings]
+        data_hashes = [r.data_hash for r in readings]
 
         # --------------------------------------------------
         # 🔹 Validate Image Upload
@@ -47,7 +53,12 @@ def predict_batch(batch_id):
         # 🔥 RUN AI ANALYSIS
         # --------------------------------------------------
         try:
-            ai_result = run_ai_analysis(sensor_data, image_file)
+            ai_result = run_ai_analysis(
+                sensor_data,
+                image_file,
+                aggregates=get_batch_aggregates(batch.id, readings),
+                sensor_fingerprint=merkle_root
+            )
         except Exception as ai_error:
             return jsonify({
                 "error": "AI processing failed",
@@ -74,11 +85,11 @@ def predict_batch(batch_id):
             }), 500
 
         # --------------------------------------------------
-        # 🌳 Generate Merkle Root (use stored hashes!)
+        # 🌳 Merkle Tree (same readings as the root above)
         # --------------------------------------------------
         try:
-            hashes = [r.data_hash for r in readings if r.data_hash]
-            merkle_root = generate_merkle_root(hashes)
+            # Keep tree levels for batch proof requests
+            save_batch_tree(batch.id, data_hashes)
         except Exception as merkle_error:
             return jsonify({
                 "error": "Merkle root generation failed",
@@ -86,14 +97,17 @@ def predict_batch(batch_id):
             }), 500
 
         # --------------------------------------------------
-        # 🔥 Generate IPFS Metadata
+        # 🔥 Generate IPFS Metadata (CID computed locally)
         # --------------------------------------------------
         try:
             metadata = generate_metadata(batch, ai_result)
             metadata["merkle_root"] = merkle_root
-            metadata["sensor_readings"] = sensor_data
+            metadata["sensor_readings"] = pack_sensor_readings(
+                sensor_data, current_app.config["IPFS_SENSOR_ENCODING"]
+            )
 
-            cid = upload_json_to_ipfs(metadata)
+            pin = prepare_metadata_pin(metadata, local_cid=current_app.config["IPFS_LOCAL_CID"])
+            cid = pin.cid
         except Exception as ipfs_error:
             return jsonify({
                 "error": "IPFS upload failed",
@@ -105,7 +119,11 @@ def predict_batch(batch_id):
         # --------------------------------------------------
         try:
             batch.ipfs_cid = cid
+            batch.pin_status = pin.status
             batch.merkle_root = merkle_root
+
+            # Bytes behind the CID survive restarts until pinned
+            save_pending_pin(batch.id, pin)
             db.session.commit()
         except Exception as save_error:
             db.session.rollback()
@@ -114,12 +132,16 @@ def predict_batch(batch_id):
                 "details": str(save_error)
             }), 500
 
+        # 📌 Pin the same bytes to Pinata in the background
+        schedule_pin(current_app._get_current_object(), batch.id, pin)
+
         # --------------------------------------------------
         # 🔥 FINAL RESPONSE
         # --------------------------------------------------
         return jsonify({
             "batch_id": str(batch.batch_id),
             "ipfs_cid": str(cid),
+            "pin_status": pin.status,
             "merkle_root": str(merkle_root),
             "ai_analysis": {
                 "environmental_risk": float(ai_result.get("environmental_risk", 0)),
@@ -141,7 +163,7 @@ def predict_batch(batch_id):
 @jwt_required()
 def analyze_batch(batch_id):
     try:
-        batch = SpinachBatch.query.filter_by(batch_id=batch_id).first()
+        batch = get_batch_or_none(batch_id)
         if not batch:
             return jsonify({"error": "Batch not found"}), 404
 
@@ -1,13 +1,19 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from database.db import db
 from models.batch_model import SpinachBatch
 from models.sensor_model import SensorReading
 from models.user_model import User
-from services.merkle_service import generate_merkle_root
-from services.ipfs_service import upload_to_ipfs
+from services.aggregate_service import get_batch_aggregates
+from services.batch_cache import cache_batch, resolve_batch, get_batch_or_none
+from services.batch_listing import list_batches, parse_fields
+from services.merkle_service import load_readings_with_root, save_batch_tree, load_batch_tree, generate_batch_proofs
+from services.pin_service import prepare_metadata_pin, save_pending_pin, schedule_pin
 from services.ai_service import run_ai_analysis, generate_metadata
 from utils.hash_utils import hash_sensor_reading
+from utils.ai_readiness import require_ai_models
+from utils.query_utils import decode_cursor, parse_limit, parse_time_range
+from utils.sensor_codec import pack_sensor_readings
 
 batch_bp = Blueprint("batch_bp", __name__)
 
@@ -41,7 +47,7 @@ def create_batch():
         if not batch_id:
             return jsonify({"error": "Missing batch_id"}), 400
 
-        existing = SpinachBatch.query.filter_by(batch_id=batch_id).first()
+        existing = resolve_batch(batch_id)
         if existing:
             return jsonify({"error": "Batch already exists"}), 400
 
@@ -50,6 +56,8 @@ def create_batch():
         db.session.add(new_batch)
         db.session.commit()
 
+        cache_batch(new_batch)
+
         return jsonify({
             "message": "Batch metadata created",
             "batch": new_batch.to_dict()
@@ -60,14 +68,40 @@ def create_batch():
 
 
 # ==================================================
-# 🔹 GET ALL BATCHES
+# 🔹 GET ALL BATCHES (keyset pagination, newest first)
 # ==================================================
+# ?limit=&cursor=&fields=a,b&farm_id=&grade=&from=&to=
+# Body stays a JSON array; the next page's cursor is in X-Next-Cursor.
 @batch_bp.route("/batches", methods=["GET"])
 @jwt_required()
 def get_all_batches():
     try:
-        batches = SpinachBatch.query.all()
-        return jsonify([b.to_dict() for b in batches]), 200
+        args = request.args
+
+        try:
+            limit = parse_limit(args, current_app.config["BATCH_PAGE_SIZE"], current_app.config["BATCH_PAGE_MAX"])
+            fields = parse_fields(args.get("fields"))
+            cursor = decode_cursor(args["cursor"]) if args.get("cursor") else None
+            start, end = parse_time_range(args)
+            farm_id = int(args["farm_id"]) if args.get("farm_id") else None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        rows, next_cursor = list_batches(
+            limit,
+            fields=fields,
+            cursor=cursor,
+            farm_id=farm_id,
+            grade=args.get("grade"),
+            start=start,
+            end=end
+        )
+
+        response = jsonify(rows)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+
+        return response, 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -79,7 +113,7 @@ def get_all_batches():
 @jwt_required()
 def get_batch(batch_id):
     try:
-        batch = SpinachBatch.query.filter_by(batch_id=batch_id).first()
+        batch = get_batch_or_none(batch_id)
         if not batch:
             return jsonify({"error": "Batch not found"}), 404
         return jsonify(batch.to_dict()), 200
@@ -88,15 +122,54 @@ def get_batch(batch_id):
 
 
 # ==================================================
-# 🔹 GET SENSOR DATA
+# 🌳 BATCH MERKLE PROOFS (many / all readings)
 # ==================================================
-@batch_bp.route("/sensor-data/<batch_id>", methods=["GET"])
+@batch_bp.route("/batch/<batch_id>/merkle-proofs", methods=["GET", "POST"])
 @jwt_required()
-def get_sensor_data(batch_id):
+def get_batch_merkle_proofs(batch_id):
     try:
-        readings = SensorReading.query.filter_by(batch_id=batch_id).all()
-        return jsonify([r.to_dict() for r in readings]), 200
+        batch = get_batch_or_none(batch_id)
+        if not batch:
+            return jsonify({"error": "Batch not found"}), 404
+
+        # GET or {"all": true} -> every reading, else {"data_hashes": [...]}
+        data_hashes = None
+        if request.method == "POST":
+            data = request.get_json(silent=True) or {}
+            if not data.get("all"):
+                data_hashes = data.get("data_hashes")
+                if not isinstance(data_hashes, list) or not all(isinstance(h, str) for h in data_hashes):
+                    return jsonify({"error": "data_hashes must be a list of hashes"}), 400
+
+        # Finalized batches: proofs against the stored / pinned root only
+        tree = load_batch_tree(batch)
+        if tree is None:
+            return jsonify({"error": "No sensor data found"}), 404
+
+        if batch.merkle_root and tree.merkle_root != batch.merkle_root:
+            db.session.rollback()
+            return jsonify({
+                "error": "Stored readings no longer match the finalized Merkle root",
+                "merkle_root": batch.merkle_root
+            }), 409
+
+        proofs, missing = generate_batch_proofs(tree, data_hashes)
+
+        # Persist a freshly (re)built tree
+        db.session.commit()
+
+        return jsonify({
+            "batch_id": batch.batch_id,
+            # Root these proofs verify against (= finalized root once finalized)
+            "merkle_root": tree.merkle_root,
+            "finalized": bool(batch.merkle_root),
+            "leaf_count": tree.leaf_count,
+            "proofs": proofs,
+            "missing": missing
+        }), 200
+
     except Exception as e:
+        db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 
@@ -145,17 +218,20 @@ def add_sensor_reading(batch_id):
 # ==================================================
 @batch_bp.route("/finalize-batch/<batch_id>", methods=["POST"])
 @jwt_required()
+@require_ai_models
 def finalize_batch(batch_id):
     try:
         user = get_current_user()
         if not user or user.role != "farmer":
             return jsonify({"error": "Unauthorized"}), 403
 
-        batch = SpinachBatch.query.filter_by(batch_id=batch_id).first()
+        batch = get_batch_or_none(batch_id)
         if not batch:
             return jsonify({"error": "Batch not found"}), 404
 
-        readings = SensorReading.query.filter_by(batch_id=batch_id).all()
+        # 🔥 READINGS + MERKLE ROOT of exactly these readings (stored,
+        # pinned and cached together, whatever gets ingested meanwhile)
+        readings, merkle_root = load_readings_with_root(batch.id)
         if not readings:
             return jsonify({"error": "No sensor data found"}), 400
 
@@ -166,33 +242,49 @@ def finalize_batch(batch_id):
         # 🔥 Convert DB sensor readings to list of dicts
         sensor_data = [r.to_dict() for r in readings]
 
+        data_hashes = [r.data_hash for r in readings]
+
         # 🔥 RUN AI ANALYSIS
-        ai_result = run_ai_analysis(sensor_data, image_file)
+        ai_result = run_ai_analysis(
+            sensor_data,
+            image_file,
+            aggregates=get_batch_aggregates(batch.id, readings),
+            sensor_fingerprint=merkle_root
+        )
 
-        # 🔥 GENERATE MERKLE ROOT
-        hashes = [r.data_hash for r in readings if r.data_hash]
-        merkle_root = generate_merkle_root(hashes)
+        # 🌳 Keep tree levels for batch proof requests
+        save_batch_tree(batch.id, data_hashes)
 
         # 🔥 BUILD METADATA (WITH AI)
         metadata = generate_metadata(batch, ai_result)
         metadata["merkle_root"] = merkle_root
-        metadata["sensor_readings"] = sensor_data
+        metadata["sensor_readings"] = pack_sensor_readings(
+            sensor_data, current_app.config["IPFS_SENSOR_ENCODING"]
+        )
 
-        # 🔥 UPLOAD TO IPFS
-        ipfs_cid = upload_to_ipfs(metadata)
+        # 🔥 IPFS CID (computed locally, pinned in the background)
+        pin = prepare_metadata_pin(metadata, local_cid=current_app.config["IPFS_LOCAL_CID"])
+        ipfs_cid = pin.cid
 
         # 🔥 SAVE TO DB
         batch.merkle_root = merkle_root
         batch.ipfs_cid = ipfs_cid
+        batch.pin_status = pin.status
         batch.health_score = ai_result["health_score"]
         batch.grade = ai_result["disease_class"]
 
+        # Bytes behind the CID survive restarts until pinned
+        save_pending_pin(batch.id, pin)
+
         db.session.commit()
 
+        schedule_pin(current_app._get_current_object(), batch.id, pin)
+
         return jsonify({
             "message": "Batch finalized successfully",
             "merkle_root": merkle_root,
             "ipfs_cid": ipfs_cid,
+            "pin_status": pin.status,
             "ai_result": ai_result
         }), 200
 
@@ -1,21 +1,37 @@
-from flask import Blueprint, request, jsonify
+import itertools
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from database.db import db
-from models.sensor_model import SensorReading
-from models.batch_model import SpinachBatch
-from utils.hash_utils import hash_sensor_reading
-from datetime import datetime
+from services.batch_cache import resolve_batch
+from services.ingest_service import parse_sensor_payload, parse_sensor_payloads, store_sensor_readings
+from services.ingest_buffer import get_ingest_buffer
+from services.sensor_export import (
+    EXPORT_FORMATS,
+    buffered,
+    iter_batch_readings,
+    stream_csv,
+    stream_json,
+    stream_ndjson
+)
+from services.sensor_series import build_series, bucket_series, parse_bucket, parse_series_fields
+from utils.query_utils import parse_time_range
 
 sensor_bp = Blueprint("sensor_bp", __name__)
 
 
+def _buffer_full_response():
+    response = jsonify({"error": "Ingestion queue full, retry later"})
+    response.headers["Retry-After"] = "1"
+    return response, 429
+
+
 # =====================================================
 # ADD SENSOR DATA (ESP32 / IoT DEVICE)
 # =====================================================
 @sensor_bp.route("/sensor-data/<batch_id>", methods=["POST"])
 def receive_sensor_data(batch_id):
     try:
-        # Find batch using business ID
-        batch = SpinachBatch.query.filter_by(batch_id=batch_id).first()
+        # Resolve business ID -> PK (cached)
+        batch = resolve_batch(batch_id)
 
         if not batch:
             return jsonify({"error": "Batch not found"}), 404
@@ -25,39 +41,28 @@ def receive_sensor_data(batch_id):
 
         print("Incoming sensor payload:", data)
 
-        if not data:
-            return jsonify({"error": "Invalid JSON payload"}), 400
+        # Validate, convert and hash
+        try:
+            row = parse_sensor_payload(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
-        # Validate required fields
-        required_fields = ["N", "P", "K", "temperature", "humidity"]
+        data_hash = row["data_hash"]
 
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"{field} is required"}), 400
+        # Write-behind mode: acknowledge now, flusher persists later
+        buffer = get_ingest_buffer(current_app)
+        if buffer is not None:
+            if not buffer.submit(batch.id, [row]):
+                return _buffer_full_response()
 
-        # Convert values safely
-        nitrogen = float(data["N"])
-        phosphorus = float(data["P"])
-        potassium = float(data["K"])
-        temperature = float(data["temperature"])
-        humidity = float(data["humidity"])
-
-        # Generate integrity hash
-        data_hash = hash_sensor_reading(data)
+            return jsonify({
+                "message": "Sensor data accepted",
+                "batch_id": batch.batch_id,
+                "data_hash": data_hash
+            }), 202
 
         # Store sensor reading
-        reading = SensorReading(
-            batch_id=batch.id,
-            nitrogen=nitrogen,
-            phosphorus=phosphorus,
-            potassium=potassium,
-            temperature=temperature,
-            humidity=humidity,
-            data_hash=data_hash,
-            created_at=datetime.utcnow()
-        )
-
-        db.session.add(reading)
+        store_sensor_readings(batch.id, [row])
         db.session.commit()
 
         return jsonify({
@@ -73,23 +78,174 @@ def receive_sensor_data(batch_id):
 
 
 # =====================================================
-# GET SENSOR DATA FOR A BATCH (Dashboard)
+# BULK ADD SENSOR DATA (GATEWAY BUFFERED READINGS)
+# =====================================================
+@sensor_bp.route("/sensor-data/<batch_id>/bulk", methods=["POST"])
+def receive_sensor_data_bulk(batch_id):
+    try:
+        batch = resolve_batch(batch_id)
+
+        if not batch:
+            return jsonify({"error": "Batch not found"}), 404
+
+        # Accept either a bare array or {"readings": [...]}
+        data = request.get_json(force=True, silent=True)
+        readings = data.get("readings") if isinstance(data, dict) else data
+
+        if not isinstance(readings, list) or not readings:
+            return jsonify({"error": "Expected a non-empty array of readings"}), 400
+
+        max_readings = current_app.config["SENSOR_BULK_MAX_READINGS"]
+        if len(readings) > max_readings:
+            return jsonify({
+                "error": f"At most {max_readings} readings per request"
+            }), 413
+
+        # Validate + hash everything before touching the database
+        rows, results = parse_sensor_payloads(readings)
+
+        if not rows:
+            return jsonify({
+                "error": "No valid readings in payload",
+                "batch_id": batch.batch_id,
+                "results": results
+            }), 400
+
+        rejected = len(results) - len(rows)
+
+        # Write-behind mode: all-or-nothing enqueue
+        buffer = get_ingest_buffer(current_app)
+        if buffer is not None:
+            if not buffer.submit(batch.id, rows):
+                return _buffer_full_response()
+
+            for result in results:
+                if result["status"] == "stored":
+                    result["status"] = "accepted"
+
+            return jsonify({
+                "message": "Sensor data accepted",
+                "batch_id": batch.batch_id,
+                "accepted": len(rows),
+                "rejected": rejected,
+                "results": results
+            }), 202
+
+        # One multi-row INSERT, one commit
+        store_sensor_readings(batch.id, rows)
+        db.session.commit()
+
+        return jsonify({
+            "message": "Sensor data stored successfully",
+            "batch_id": batch.batch_id,
+            "stored": len(rows),
+            "rejected": rejected,
+            "results": results
+        }), 207 if rejected else 201
+
+    except Exception as e:
+        db.session.rollback()
+        print("Bulk sensor insert error:", str(e))
+        return jsonify({"error": str(e)}), 500
+
+
+# =====================================================
+# GET SENSOR DATA FOR A BATCH (Dashboard, streamed)
 # =====================================================
+# ?format=json (default, same body as before) | ndjson | csv
+# ?from=&to= (created_at range), ?after=<id> resumes after the last
+# reading received, ?limit= caps one response.
 @sensor_bp.route("/sensor-data/<batch_id>", methods=["GET"])
 def get_sensor_data(batch_id):
     try:
-        batch = SpinachBatch.query.filter_by(batch_id=batch_id).first()
+        batch = resolve_batch(batch_id)
 
         if not batch:
             return jsonify({"error": "Batch not found"}), 404
 
-        readings = SensorReading.query.filter_by(batch_id=batch.id).all()
+        args = request.args
+        export_format = args.get("format", "json")
+
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({"error": f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+        try:
+            start, end = parse_time_range(args)
+            after_id = int(args["after"]) if args.get("after") else None
+            limit = int(args["limit"]) if args.get("limit") else None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        if limit is not None and limit < 1:
+            return jsonify({"error": "limit must be positive"}), 400
+
+        rows = iter_batch_readings(batch.id, start=start, end=end, after_id=after_id, limit=limit)
+
+        # Run the query now so database errors still get a proper 500
+        first = next(rows, None)
+        rows = itertools.chain([first], rows) if first is not None else iter(())
+
+        if export_format == "ndjson":
+            chunks = stream_ndjson(rows)
+        elif export_format == "csv":
+            chunks = stream_csv(rows)
+        else:
+            chunks = stream_json(batch.batch_id, rows)
+
+        response = Response(
+            stream_with_context(buffered(chunks)),
+            mimetype=EXPORT_FORMATS[export_format]
+        )
+
+        if export_format == "csv":
+            response.headers["Content-Disposition"] = f'attachment; filename="{batch.batch_id}-sensor-data.csv"'
+
+        return response
+
+    except Exception as e:
+        print("Fetch sensor error:", str(e))
+        return jsonify({"error": str(e)}), 500
+
+
+# =====================================================
+# GET BUCKETED SENSOR SERIES (Dashboard charts)
+# =====================================================
+# ?bucket=5m&fields=temperature,humidity&from=&to=&max_points=
+# min / max / avg / count per bucket from SQL; more than max_points
+# buckets are reduced per field with LTTB (max_points=0 disables).
+@sensor_bp.route("/sensor-data/<batch_id>/series", methods=["GET"])
+def get_sensor_series(batch_id):
+    try:
+        batch = resolve_batch(batch_id)
+
+        if not batch:
+            return jsonify({"error": "Batch not found"}), 404
+
+        args = request.args
+
+        try:
+            bucket_seconds = parse_bucket(args.get("bucket", "5m"))
+            fields = parse_series_fields(args.get("fields"))
+            start, end = parse_time_range(args)
+            max_points = int(args.get("max_points", current_app.config["SENSOR_SERIES_MAX_POINTS"]))
+
+            if max_points and max_points < 3:
+                raise ValueError("max_points must be 0 or at least 3")
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        rows = bucket_series(batch.id, bucket_seconds, fields, start=start, end=end)
+        series, downsampled = build_series(rows, fields, max_points=max_points)
 
         return jsonify({
             "batch_id": batch.batch_id,
-            "sensor_readings": [r.to_dict() for r in readings]
+            "bucket": args.get("bucket", "5m"),
+            "bucket_seconds": bucket_seconds,
+            "bucket_count": len(rows),
+            "downsampled": downsampled,
+            "series": series
         }), 200
 
     except Exception as e:
-        print("Fetch sensor error:", str(e))
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        print("Sensor series error:", str(e))
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,95 @@
+from sqlalchemy import func
+from database.db import db
+from models.aggregate_model import BatchSensorAggregate
+from models.sensor_model import SensorReading
+
+
+# =====================================================
+# 🔹 SQL TOTALS (seeding / legacy batches)
+# =====================================================
+
+def compute_batch_aggregates(batch_pk):
+    """
+    Build an (unsaved) BatchSensorAggregate from stored readings.
+    """
+
+    row = db.session.query(
+        func.count(SensorReading.id),
+        func.coalesce(func.sum(SensorReading.nitrogen), 0.0),
+        func.coalesce(func.sum(SensorReading.phosphorus), 0.0),
+        func.coalesce(func.sum(SensorReading.potassium), 0.0),
+        func.coalesce(func.sum(SensorReading.temperature), 0.0),
+        func.coalesce(func.sum(SensorReading.humidity), 0.0)
+    ).filter(SensorReading.batch_id == batch_pk).one()
+
+    return BatchSensorAggregate(
+        batch_id=batch_pk,
+        reading_count=row[0],
+        sum_nitrogen=row[1],
+        sum_phosphorus=row[2],
+        sum_potassium=row[3],
+        sum_temperature=row[4],
+        sum_humidity=row[5]
+    )
+
+
+# =====================================================
+# 🔥 INGEST HOOK
+# =====================================================
+
+def apply_readings_to_aggregates(batch_pk, rows):
+    """
+    Add parsed rows to the batch running totals.
+    Call while holding the batch frontier lock and BEFORE inserting
+    the rows, so first-time seeding only sees older readings.
+    """
+
+    aggregates = db.session.get(BatchSensorAggregate, batch_pk)
+
+    if aggregates is None:
+        aggregates = compute_batch_aggregates(batch_pk)
+        db.session.add(aggregates)
+
+    aggregates.add_rows(rows)
+
+    return aggregates
+
+
+# =====================================================
+# 🔹 READ PATH (AI feature vector)
+# =====================================================
+
+def get_batch_aggregates(batch_pk, readings=None):
+    """
+    Running totals for a batch; legacy batches without a row yet are
+    summed in SQL (persisted on their next ingest).
+
+    Pass the readings already loaded (first n in id order) to get totals
+    for exactly those: the stored row is used when it covers the same
+    count, otherwise (rows ingested since) they are summed in memory.
+    """
+
+    aggregates = db.session.get(BatchSensorAggregate, batch_pk, populate_existing=True)
+
+    if readings is not None:
+        if aggregates is not None and aggregates.reading_count == len(readings):
+            return aggregates
+
+        snapshot = BatchSensorAggregate(batch_id=batch_pk)
+        snapshot.add_rows([
+            {
+                "nitrogen": r.nitrogen,
+                "phosphorus": r.phosphorus,
+                "potassium": r.potassium,
+                "temperature": r.temperature,
+                "humidity": r.humidity
+            }
+            for r in readings
+        ])
+
+        return snapshot
+
+    if aggregates is None:
+        aggregates = compute_batch_aggregates(batch_pk)
+
+    return aggregates
@@ -1,17 +1,17 @@
+import atexit
+import logging
+import multiprocessing
 import os
+import threading
+import time
 import numpy as np
-import tensorflow as tf
-import joblib
-from PIL import Image
 from statistics import mean
 from datetime import datetime
-from tensorflow.keras.applications.efficientnet import preprocess_input
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from config import Config
+from services.inference_batcher import InferenceBatcher
 
 
-# =====================================================
-# 🔥 SAFE MODEL LOADING (Singleton Style)
-# =====================================================
-
 # =====================================================
 # 🔥 CORRECT PROJECT ROOT PATH
 # =====================================================
@@ -23,28 +23,224 @@ ENV_MODEL_PATH = os.path.join(BASE_DIR, "env_model.pkl")
 ENV_SCALER_PATH = os.path.join(BASE_DIR, "env_scaler.pkl")
 ANOMALY_MODEL_PATH = os.path.join(BASE_DIR, "anomaly_model.pkl")
 
+
+# =====================================================
+# 🔥 SAFE MODEL LOADING (Singleton Style)
+# =====================================================
+
 tomato_model = None
 env_model = None
 env_scaler = None
 anomaly_model = None
 
+# Heavy libraries (TensorFlow, joblib/sklearn, PIL) are imported inside
+# the loaders so importing this module stays cheap at app start.
+
+MODEL_NAMES = ("tomato_model", "env_model", "env_scaler", "anomaly_model")
+
+_model_status = {name: "not_loaded" for name in MODEL_NAMES}
+_model_errors = {}
+_models_warm = threading.Event()
+_load_lock = threading.Lock()
+_loader_lock = threading.Lock()
+_loader_thread = None
+_loader_pid = None
+
+# Failed loads back off exponentially (AI_LOAD_RETRY_BASE .. _MAX) so
+# readiness probes / 503 retries don't start a reload storm
+_load_failures = 0
+_next_load_at = 0.0
 
-def load_models():
+
+def _load_tomato_model():
+    if Config.AI_BACKEND == "tflite":
+        from services.tflite_backend import load_tflite_classifier
+        return load_tflite_classifier(
+            TOMATO_MODEL_PATH,
+            Config.TFLITE_QUANTIZATION,
+            preprocess=load_image_tensor,
+            calibration_dir=Config.TFLITE_CALIBRATION_DIR,
+            num_threads=Config.TFLITE_NUM_THREADS
+        )
+
+    import tensorflow as tf
+    return tf.keras.models.load_model(TOMATO_MODEL_PATH)
+
+
+def _load_joblib(path):
+    import joblib
+    return joblib.load(path)
+
+
+def load_models(names=MODEL_NAMES):
     global tomato_model, env_model, env_scaler, anomaly_model
 
-    if tomato_model is None:
-        print("Loading tomato AI model...")
-        tomato_model = tf.keras.models.load_model(TOMATO_MODEL_PATH)
-        print("Tomato model loaded.")
+    with _load_lock:
+        loaders = (
+            ("tomato_model", _load_tomato_model),
+            ("env_model", lambda: _load_joblib(ENV_MODEL_PATH)),
+            ("env_scaler", lambda: _load_joblib(ENV_SCALER_PATH)),
+            ("anomaly_model", lambda: _load_joblib(ANOMALY_MODEL_PATH))
+        )
+        loaded = []
 
-    if env_model is None:
-        env_model = joblib.load(ENV_MODEL_PATH)
+        for name, loader in loaders:
+            if name not in names or globals()[name] is not None:
+                continue
 
-    if env_scaler is None:
-        env_scaler = joblib.load(ENV_SCALER_PATH)
+            _model_status[name] = "loading"
+            print(f"Loading {name}...")
 
-    if anomaly_model is None:
-        anomaly_model = joblib.load(ANOMALY_MODEL_PATH)
+            try:
+                globals()[name] = loader()
+            except Exception as e:
+                _model_status[name] = "failed"
+                _model_errors[name] = str(e)
+                raise
+
+            _model_status[name] = "loaded"
+            _model_errors.pop(name, None)
+            loaded.append(name)
+
+        if loaded:
+            print(f"AI models loaded ({Config.AI_BACKEND}): {', '.join(loaded)}")
+
+
+# =====================================================
+# 🔥 BACKGROUND LOADING + WARM-UP + READINESS
+# =====================================================
+
+def warm_up_models():
+    """
+    Dummy forward passes so the first real request does not pay for
+    graph tracing / allocation.
+    """
+
+    _run_tomato_model(np.zeros((1, 224, 224, 3), dtype=np.float32))
+
+    features = env_scaler.transform(build_feature_vector(0.0, 0.0, 0.0, 0.0, 0.0))
+    env_model.predict(features)
+    anomaly_model.predict(features)
+
+
+def load_and_warm_models():
+    try:
+        load_models()
+        warm_up_models()
+
+        for name in MODEL_NAMES:
+            _model_status[name] = "ready"
+
+        _models_warm.set()
+        logging.info("✅ AI Models Loaded and warmed up")
+
+    except Exception as e:
+        logging.error(f"❌ AI Model Loading Failed: {e}")
+
+
+def _warm_inference_pool(pool):
+    """
+    Models live in the inference processes: start them and mirror their
+    load status here so readiness probes stay meaningful.
+    """
+
+    results = pool.warm()
+    ready = bool(results) and all(worker_ready for worker_ready, _ in results)
+
+    if ready:
+        for name in MODEL_NAMES:
+            _model_status[name] = "ready"
+            _model_errors.pop(name, None)
+
+        _models_warm.set()
+        logging.info(f"✅ Inference pool ready ({pool.workers} processes)")
+        return
+
+    for worker_ready, status in results:
+        if worker_ready:
+            continue
+
+        for name, info in status.items():
+            _model_status[name] = info["status"]
+            if "error" in info:
+                _model_errors[name] = info["error"]
+
+    logging.error("❌ Inference pool failed to load models")
+
+
+def _load_and_warm():
+    global _load_failures, _next_load_at
+
+    pool = get_inference_pool()
+
+    if pool is not None:
+        try:
+            _warm_inference_pool(pool)
+        except Exception as e:
+            logging.error(f"❌ Inference pool start failed: {e}")
+    else:
+        load_and_warm_models()
+
+    with _loader_lock:
+        if _models_warm.is_set():
+            _load_failures = 0
+            return
+
+        delay = min(Config.AI_LOAD_RETRY_BASE * 2 ** _load_failures, Config.AI_LOAD_RETRY_MAX)
+        _load_failures += 1
+        _next_load_at = time.monotonic() + delay
+
+    logging.warning(f"AI model load attempt {_load_failures} failed; next attempt in {delay:.0f}s")
+
+
+def model_load_retry_after():
+    """
+    Seconds until another load attempt is allowed (0 = now).
+    """
+
+    return max(0.0, _next_load_at - time.monotonic())
+
+
+def start_background_model_loading():
+    """
+    Load + warm models in a daemon thread (once per process, so
+    pre-fork workers start their own loader).
+    """
+
+    global _loader_thread, _loader_pid
+
+    if _inference_worker or _spawn_bootstrapping():
+        return
+
+    with _loader_lock:
+        if _models_warm.is_set():
+            return
+
+        if _loader_thread is not None and _loader_thread.is_alive() and _loader_pid == os.getpid():
+            return
+
+        # Backing off after a failed load
+        if time.monotonic() < _next_load_at:
+            return
+
+        _loader_pid = os.getpid()
+        _loader_thread = threading.Thread(target=_load_and_warm, name="ai-model-loader", daemon=True)
+        _loader_thread.start()
+
+
+def models_ready():
+    return _models_warm.is_set()
+
+
+def model_status():
+    status = {}
+
+    for name in MODEL_NAMES:
+        status[name] = {"status": _model_status[name]}
+        if name in _model_errors:
+            status[name]["error"] = _model_errors[name]
+
+    return status
 
 
 # =====================================================
@@ -71,6 +267,30 @@ def extract_environment_features(sensor_data):
     except ValueError:
         raise Exception("Invalid sensor data format")
 
+    return build_feature_vector(N, P, K, temperature, humidity)
+
+
+def extract_environment_features_from_aggregates(aggregates):
+    """
+    O(1) feature vector from a batch's running sensor totals
+    (BatchSensorAggregate) instead of every reading.
+    """
+
+    means = aggregates.means() if aggregates is not None else None
+
+    if not means:
+        return None
+
+    return build_feature_vector(
+        means["nitrogen"],
+        means["phosphorus"],
+        means["potassium"],
+        means["temperature"],
+        means["humidity"]
+    )
+
+
+def build_feature_vector(N, P, K, temperature, humidity):
     np_ratio = N / (P + 1)
     nk_ratio = N / (K + 1)
 
@@ -81,14 +301,26 @@ def extract_environment_features(sensor_data):
 # 🔹 ENVIRONMENTAL RISK MODEL
 # =====================================================
 
-def predict_environment(sensor_data):
-    load_models()
-
-    features = extract_environment_features(sensor_data)
+def predict_environment(sensor_data, aggregates=None):
+    if aggregates is not None:
+        features = extract_environment_features_from_aggregates(aggregates)
+    else:
+        features = extract_environment_features(sensor_data)
 
     if features is None:
         return 0.0, False
 
+    pool = get_inference_pool()
+
+    if pool is not None:
+        return pool.score_environment(features)
+
+    return score_environment(features)
+
+
+def score_environment(features):
+    load_models()
+
     features_scaled = env_scaler.transform(features)
 
     env_risk = float(env_model.predict(features_scaled)[0])
@@ -101,23 +333,153 @@ def predict_environment(sensor_data):
 
 
 # =====================================================
-# 🔹 IMAGE PREDICTION (FIXED SINGLE INPUT)
+# 🔹 IMAGE PREDICTION (MICRO-BATCHED ACROSS REQUESTS)
 # =====================================================
 
-def predict_disease(image_file):
+def _run_tomato_model(batch):
+    """
+    One forward pass of the grading model over an (N, 224, 224, 3) batch
+    (Keras model or TFLiteClassifier, see AI_BACKEND), in the inference
+    pool when INFERENCE_WORKERS > 0.
+    """
+
+    pool = get_inference_pool()
+
+    if pool is not None:
+        return pool.predict_images(batch)
+
+    return run_tomato_model_local(batch)
+
+
+def run_tomato_model_local(batch):
     load_models()
 
+    return tomato_model.predict_on_batch(batch)
+
+
+# =====================================================
+# 🔹 INFERENCE PROCESS POOL
+# =====================================================
+
+_inference_pool = None
+_inference_pool_pid = None
+_inference_pool_lock = threading.Lock()
+_inference_worker = False
+
+
+def mark_inference_worker():
+    """
+    Called in the inference processes so they run models locally
+    instead of dispatching to a pool of their own.
+    """
+
+    global _inference_worker
+    _inference_worker = True
+
+
+def _spawn_bootstrapping():
+    """
+    True while a spawned child process is still re-importing its
+    parent's __main__ (before the pool initializer has run). An app
+    built at import time must not load models or start pools then.
+    """
+
+    return getattr(multiprocessing.current_process(), "_inheriting", False)
+
+
+def get_inference_pool():
+    """
+    Shared pool of inference processes for this web worker
+    (None when INFERENCE_WORKERS is 0 or inside an inference process).
+    """
+
+    global _inference_pool, _inference_pool_pid
+
+    if Config.INFERENCE_WORKERS <= 0 or _inference_worker or _spawn_bootstrapping():
+        return None
+
+    with _inference_pool_lock:
+        if _inference_pool is None or _inference_pool_pid != os.getpid():
+            from services.inference_pool import InferencePool
+
+            _inference_pool_pid = os.getpid()
+            _inference_pool = InferencePool(
+                Config.INFERENCE_WORKERS,
+                timeout=Config.INFERENCE_TIMEOUT or None
+            )
+            atexit.register(_inference_pool.shutdown)
+
+    return _inference_pool
+
+
+_disease_batcher = None
+_disease_batcher_lock = threading.Lock()
+
+
+def get_disease_batcher():
+    """
+    Shared micro-batching dispatcher for predict_disease
+    (None when INFERENCE_BATCHING is off).
+    """
+
+    global _disease_batcher
+
+    if not Config.INFERENCE_BATCHING:
+        return None
+
+    with _disease_batcher_lock:
+        if _disease_batcher is None:
+            _disease_batcher = InferenceBatcher(
+                _run_tomato_model,
+                max_batch_size=Config.INFERENCE_MAX_BATCH,
+                max_wait_ms=Config.INFERENCE_MAX_WAIT_MS,
+                name="disease-batcher"
+            )
+
+    return _disease_batcher
+
+
+def load_image_tensor(image_file, out=None):
+    """
+    Decode an uploaded image into the (1, 224, 224, 3) model input.
+    Pass `out` (see image_preprocess.get_input_buffer) to reuse a buffer.
+    """
+
+    from tensorflow.keras.applications.efficientnet import preprocess_input
+    from services.image_preprocess import image_to_array
+
+    image_file.seek(0)
+
+    img_array = image_to_array(image_file, out=out, fast=Config.IMAGE_FAST_DECODE)
+
+    return preprocess_input(img_array)
+
+
+def predict_disease(image_file):
+    if get_inference_pool() is None:
+        load_models()
+
     try:
-        image_file.seek(0)
+        from services.image_preprocess import get_input_buffer, release_input_buffer
+
+        # Caller blocks until the forward pass is done, so the
+        # per-thread buffer is free again on the next call
+        img_array = load_image_tensor(image_file, out=get_input_buffer())
 
-        img = Image.open(image_file).convert("RGB").resize((224, 224))
+        # ✅ Concurrent callers share one batched forward pass
+        batcher = get_disease_batcher()
 
-        img_array = np.array(img, dtype=np.float32)
-        img_array = np.expand_dims(img_array, axis=0)
-        img_array = preprocess_input(img_array)
+        if batcher is not None:
+            timeout = Config.INFERENCE_TIMEOUT or None
 
-        # ✅ FIXED: Single input model
-        prediction = tomato_model.predict(img_array, verbose=0)
+            try:
+                prediction = batcher.predict(img_array, timeout=timeout)
+            except FuturesTimeoutError:
+                # The queued input may still be read: never reuse it
+                release_input_buffer()
+                raise TimeoutError(f"disease model did not answer within {timeout}s")
+        else:
+            prediction = _run_tomato_model(img_array)
 
         prediction = np.array(prediction)
 
@@ -142,13 +504,18 @@ def predict_disease(image_file):
 # 🔹 HYBRID FUSION LOGIC
 # =====================================================
 
+DISEASE_WEIGHT = 0.6
+ENV_RISK_WEIGHT = 0.3
+ANOMALY_PENALTY = 0.2
+
+
 def calculate_health_score(disease_prob, env_risk, anomaly_detected):
 
-    anomaly_penalty = 0.2 if anomaly_detected else 0.0
+    anomaly_penalty = ANOMALY_PENALTY if anomaly_detected else 0.0
 
     health_score = 1 - (
-        0.6 * disease_prob +
-        0.3 * env_risk +
+        DISEASE_WEIGHT * disease_prob +
+        ENV_RISK_WEIGHT * env_risk +
         anomaly_penalty
     )
 
@@ -157,17 +524,81 @@ def calculate_health_score(disease_prob, env_risk, anomaly_detected):
     return round(health_score, 4)
 
 
+# =====================================================
+# 🔹 VECTORIZED SCORING (offline re-scoring of many batches)
+# =====================================================
+
+ENV_MODEL_NAMES = ("env_model", "env_scaler", "anomaly_model")
+
+
+def build_feature_matrix(N, P, K, temperature, humidity):
+    """
+    Same features as build_feature_vector for arrays of batch means,
+    one row per batch.
+    """
+
+    N, P, K = np.asarray(N), np.asarray(P), np.asarray(K)
+
+    return np.column_stack([
+        N, P, K, temperature, humidity,
+        N / (P + 1),
+        N / (K + 1)
+    ]).astype(np.float32)
+
+
+def score_environment_batch(features):
+    """
+    (env_risk, anomaly_detected) arrays for an (n, 7) feature matrix.
+    """
+
+    load_models(ENV_MODEL_NAMES)
+
+    features_scaled = env_scaler.transform(features)
+
+    env_risk = np.clip(np.asarray(env_model.predict(features_scaled), dtype=np.float64), 0.0, 1.0)
+    anomaly_detected = np.asarray(anomaly_model.predict(features_scaled)) == -1
+
+    return np.round(env_risk, 4), anomaly_detected
+
+
+def calculate_health_scores(disease_prob, env_risk, anomaly_detected):
+    """
+    Array version of calculate_health_score.
+    """
+
+    health_score = 1 - (
+        DISEASE_WEIGHT * np.asarray(disease_prob, dtype=np.float64) +
+        ENV_RISK_WEIGHT * np.asarray(env_risk, dtype=np.float64) +
+        np.where(anomaly_detected, ANOMALY_PENALTY, 0.0)
+    )
+
+    return np.round(np.clip(health_score, 0.0, 1.0), 4)
+
+
 # =====================================================
 # 🔥 MAIN AI ENTRY
 # =====================================================
 
-def run_ai_analysis(sensor_data, image_file):
+def run_ai_analysis(sensor_data, image_file, aggregates=None, sensor_fingerprint=None):
 
-    if not sensor_data:
+    if not sensor_data and aggregates is None:
         raise Exception("Sensor data required")
 
-    # Environmental analysis
-    env_risk, anomaly_detected = predict_environment(sensor_data)
+    # Identical image + readings + models -> reuse the previous result
+    cache = get_inference_cache()
+    cache_key = None
+
+    if cache is not None and sensor_fingerprint:
+        from services.inference_cache import image_digest, make_cache_key
+
+        cache_key = make_cache_key(image_digest(image_file), sensor_fingerprint, get_model_version())
+        cached = cache.get(cache_key)
+
+        if cached is not None:
+            return cached
+
+    # Environmental analysis (running totals when available)
+    env_risk, anomaly_detected = predict_environment(sensor_data, aggregates)
 
     # Tomato grading prediction
     disease_class, disease_probability = predict_disease(image_file)
@@ -178,7 +609,7 @@ def run_ai_analysis(sensor_data, image_file):
         anomaly_detected
     )
 
-    return {
+    result = {
         "environmental_risk": env_risk,
         "disease_probability": disease_probability,
         "health_score": health_score,
@@ -186,6 +617,69 @@ def run_ai_analysis(sensor_data, image_file):
         "disease_class": disease_class
     }
 
+    if cache_key is not None:
+        cache.put(cache_key, result)
+
+    return result
+
+
+# =====================================================
+# 🔹 INFERENCE RESULT CACHE + MODEL VERSION
+# =====================================================
+
+_inference_cache = None
+_model_version = None
+_cache_lock = threading.Lock()
+
+
+def get_inference_cache():
+    """
+    Process-wide result cache (None when INFERENCE_CACHE_SIZE is 0).
+    """
+
+    global _inference_cache
+
+    if Config.INFERENCE_CACHE_SIZE <= 0:
+        return None
+
+    with _cache_lock:
+        if _inference_cache is None:
+            from services.inference_cache import InferenceCache
+            _inference_cache = InferenceCache(
+                max_entries=Config.INFERENCE_CACHE_SIZE,
+                disk_dir=Config.INFERENCE_CACHE_DIR,
+                disk_max_entries=Config.INFERENCE_CACHE_DISK_MAX_ENTRIES,
+                disk_ttl=Config.INFERENCE_CACHE_DISK_TTL or None
+            )
+
+    return _inference_cache
+
+
+def get_model_version():
+    """
+    MODEL_VERSION when set, else a fingerprint of the model files and
+    backend, so retraining or switching backend never hits stale results.
+    """
+
+    global _model_version
+
+    if _model_version is None:
+        if Config.MODEL_VERSION:
+            _model_version = Config.MODEL_VERSION
+        else:
+            parts = [Config.AI_BACKEND, Config.TFLITE_QUANTIZATION if Config.AI_BACKEND == "tflite" else ""]
+
+            for path in (TOMATO_MODEL_PATH, ENV_MODEL_PATH, ENV_SCALER_PATH, ANOMALY_MODEL_PATH):
+                try:
+                    stat = os.stat(path)
+                    parts.append(f"{os.path.basename(path)}:{stat.st_size}:{int(stat.st_mtime)}")
+                except OSError:
+                    parts.append(f"{os.path.basename(path)}:missing")
+
+            _model_version = "|".join(parts)
+
+    return _model_version
+
 
 # =====================================================
 # 🔹 IPFS METADATA BUILDER
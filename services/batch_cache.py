@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from sqlalchemy import event
+from config import Config
+from database.db import db
+from models.batch_model import SpinachBatch
+
+
+# =====================================================
+# 🔹 CACHED VIEW OF A BATCH (immutable fields only)
+# =====================================================
+
+CachedBatch = namedtuple("CachedBatch", ["id", "batch_id", "created_at"])
+
+
+# =====================================================
+# 🔥 BOUNDED LRU + TTL CACHE (per process)
+# =====================================================
+
+class BatchCache:
+    """
+    Maps business batch_id -> CachedBatch.
+    Thread-safe, evicts least recently used entries beyond max_size
+    and treats entries older than ttl_seconds as misses.
+    """
+
+    def __init__(self, max_size=10000, ttl_seconds=300):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, batch_id):
+        with self._lock:
+            entry = self._entries.get(batch_id)
+
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+
+            if expires_at < time.monotonic():
+                del self._entries[batch_id]
+                return None
+
+            self._entries.move_to_end(batch_id)
+            return value
+
+    def put(self, value):
+        with self._lock:
+            self._entries[value.batch_id] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(value.batch_id)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def invalidate(self, batch_id):
+        with self._lock:
+            self._entries.pop(batch_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+batch_cache = BatchCache(Config.BATCH_CACHE_SIZE, Config.BATCH_CACHE_TTL)
+
+
+# =====================================================
+# 🔹 SHARED HELPERS FOR BLUEPRINTS
+# =====================================================
+
+def cache_batch(batch):
+    """
+    Store a freshly created / loaded SpinachBatch in the cache.
+    """
+
+    return batch_cache.put(CachedBatch(batch.id, batch.batch_id, batch.created_at))
+
+
+def resolve_batch(batch_id):
+    """
+    Resolve business batch_id to CachedBatch (integer PK + immutable
+    metadata). Returns None when the batch does not exist.
+    """
+
+    cached = batch_cache.get(batch_id)
+    if cached is not None:
+        return cached
+
+    row = db.session.query(
+        SpinachBatch.id,
+        SpinachBatch.batch_id,
+        SpinachBatch.created_at
+    ).filter_by(batch_id=batch_id).first()
+
+    if row is None:
+        return None
+
+    return batch_cache.put(CachedBatch(row.id, row.batch_id, row.created_at))
+
+
+def get_batch_or_none(batch_id):
+    """
+    Load the full SpinachBatch row by PK via the cache
+    (used by routes that need mutable columns).
+    """
+
+    cached = resolve_batch(batch_id)
+    if cached is None:
+        return None
+
+    batch = db.session.get(SpinachBatch, cached.id)
+
+    # Row vanished behind our back (deleted in another process)
+    if batch is None:
+        batch_cache.invalidate(batch_id)
+
+    return batch
+
+
+# =====================================================
+# 🔹 INVALIDATION (ORM deletes)
+# =====================================================
+
+@event.listens_for(SpinachBatch, "after_delete")
+def _invalidate_deleted_batch(mapper, connection, target):
+    batch_cache.invalidate(target.batch_id)
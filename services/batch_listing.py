@@ -0,0 +1,76 @@
+from sqlalchemy import select, tuple_
+from database.db import db
+from models.batch_model import BATCH_FIELD_SERIALIZERS, BATCH_PROJECTION_EXTRAS, SpinachBatch
+from utils.query_utils import encode_cursor
+
+
+# =====================================================
+# 🔥 KEYSET-PAGINATED BATCH LISTING
+# =====================================================
+#
+# Newest first on (created_at DESC, id DESC); the next page starts
+# strictly after the last row seen, so every page is one index range
+# scan regardless of depth (no OFFSET).
+
+PROJECTABLE_FIELDS = {**BATCH_FIELD_SERIALIZERS, **BATCH_PROJECTION_EXTRAS}
+
+
+def parse_fields(value):
+    """
+    ?fields=a,b -> list of field names (None = full to_dict()).
+    """
+
+    if not value:
+        return None
+
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in PROJECTABLE_FIELDS]
+
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    return fields
+
+
+def list_batches(limit, fields=None, cursor=None, farm_id=None, grade=None, start=None, end=None):
+    """
+    One page of batches -> (rows, next_cursor or None).
+    """
+
+    fields = fields or list(BATCH_FIELD_SERIALIZERS)
+
+    columns = [SpinachBatch.id, SpinachBatch.created_at]
+    columns += [getattr(SpinachBatch, field) for field in fields]
+
+    stmt = select(*columns).where(SpinachBatch.created_at.isnot(None))
+
+    if farm_id is not None:
+        stmt = stmt.where(SpinachBatch.farm_id == farm_id)
+    if grade:
+        stmt = stmt.where(SpinachBatch.disease_class == grade)
+    if start is not None:
+        stmt = stmt.where(SpinachBatch.created_at >= start)
+    if end is not None:
+        stmt = stmt.where(SpinachBatch.created_at < end)
+    if cursor is not None:
+        stmt = stmt.where(tuple_(SpinachBatch.created_at, SpinachBatch.id) < tuple_(*cursor))
+
+    stmt = stmt.order_by(SpinachBatch.created_at.desc(), SpinachBatch.id.desc()).limit(limit + 1)
+
+    result = db.session.execute(stmt).all()
+    page = result[:limit]
+
+    rows = [
+        {
+            field: PROJECTABLE_FIELDS[field](value)
+            for field, value in zip(fields, row[2:])
+        }
+        for row in page
+    ]
+
+    next_cursor = None
+    if len(result) > limit:
+        last = page[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return rows, next_cursor
@@ -0,0 +1,90 @@
+import threading
+import numpy as np
+from PIL import Image
+
+
+# =====================================================
+# 🔥 FAST IMAGE DECODE + PREPROCESS (grading model input)
+# =====================================================
+#
+# Phone uploads are ~12 MP JPEGs but the model only needs 224x224.
+# For JPEG, Image.draft() lets libjpeg decode at 1/2, 1/4 or 1/8
+# scale (DCT scaling), still >= the target size, so most pixels are
+# never decoded. Other formats use Pillow's reducing_gap (box reduce
+# before the final resample). Pixels are written straight into a
+# float32 (1, 224, 224, 3) buffer.
+#
+# Tolerance vs the legacy full decode + bicubic resize (0-255 scale):
+# mean |diff| <= 2.0 per channel value. DCT downscaling is a smoother
+# low-pass than bicubic on the full image, so single pixels on hard
+# edges can move more; benchmarks/bench_preprocess.py measures both
+# the mean and max difference for typical upload sizes.
+
+TARGET_SIZE = (224, 224)
+REDUCING_GAP = 3.0
+
+_BICUBIC = getattr(Image, "Resampling", Image).BICUBIC
+
+_local = threading.local()
+
+
+def get_input_buffer():
+    """
+    Per-thread reusable (1, 224, 224, 3) float32 model input buffer.
+    Only valid until the same thread preprocesses the next image.
+    """
+
+    buffer = getattr(_local, "buffer", None)
+
+    if buffer is None:
+        buffer = np.empty((1, TARGET_SIZE[1], TARGET_SIZE[0], 3), dtype=np.float32)
+        _local.buffer = buffer
+
+    return buffer
+
+
+def release_input_buffer():
+    """
+    Forget this thread's buffer (e.g. a timed-out call may still have it
+    queued for inference); the next get_input_buffer() allocates anew.
+    """
+
+    _local.buffer = None
+
+
+def decode_image(image_file, size=TARGET_SIZE, fast=True):
+    """
+    Decode an upload as an RGB PIL image of exactly `size`.
+    fast=False reproduces the legacy full-resolution path.
+    """
+
+    img = Image.open(image_file)
+
+    if fast and img.format == "JPEG":
+        # Must run before any pixel access
+        img.draft("RGB", size)
+
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+
+    if img.size != size:
+        img = img.resize(size, _BICUBIC, reducing_gap=REDUCING_GAP if fast else None)
+
+    return img
+
+
+def image_to_array(image_file, out=None, fast=True):
+    """
+    Decode into a (1, 224, 224, 3) float32 array (0-255 RGB).
+    Writes into `out` when given instead of allocating.
+    """
+
+    img = decode_image(image_file, fast=fast)
+
+    if out is None:
+        out = np.empty((1, TARGET_SIZE[1], TARGET_SIZE[0], 3), dtype=np.float32)
+
+    # uint8 -> float32 cast straight into the destination
+    np.copyto(out[0], np.asarray(img), casting="unsafe")
+
+    return out
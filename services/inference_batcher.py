@@ -0,0 +1,123 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+import numpy as np
+
+
+# =====================================================
+# 🔥 CROSS-REQUEST MICRO-BATCHING DISPATCHER
+# =====================================================
+
+class InferenceBatcher:
+    """
+    Collects single-sample inference calls from concurrent request
+    threads into one batched forward pass.
+
+    A batch is dispatched when max_batch_size inputs are waiting or
+    max_wait_ms has passed since the first one arrived. `forward`
+    receives an (N, ...) array and must return N output rows; each
+    caller gets its own row back.
+    """
+
+    def __init__(self, forward, max_batch_size=16, max_wait_ms=5, name="inference-batcher"):
+        self.forward = forward
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    # -------------------------------------------------
+    # 🔹 Caller side
+    # -------------------------------------------------
+
+    def submit(self, sample):
+        """
+        Queue one sample (shape (1, ...) or (...)); returns a Future.
+        """
+
+        self._ensure_started()
+
+        future = Future()
+        self._queue.put((np.asarray(sample), future))
+
+        return future
+
+    def predict(self, sample, timeout=None):
+        future = self.submit(sample)
+
+        try:
+            return future.result(timeout)
+        except FuturesTimeoutError:
+            # Still queued: drop it instead of running it for nobody
+            future.cancel()
+            raise
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    # -------------------------------------------------
+    # 🔹 Dispatcher thread
+    # -------------------------------------------------
+
+    def _collect(self):
+        items = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(items) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            try:
+                items.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return items
+
+    def _run(self):
+        while True:
+            self._dispatch(self._collect())
+
+    def _dispatch(self, items):
+        # Skip callers that gave up; the rest can no longer be cancelled
+        items = [(sample, future) for sample, future in items if future.set_running_or_notify_cancel()]
+
+        if not items:
+            return
+
+        # Any failure (bad sample shape, short output, ...) fails this
+        # batch only: the dispatcher thread must survive it
+        try:
+            samples = [
+                sample if sample.ndim and sample.shape[0] == 1 else sample[np.newaxis]
+                for sample, _ in items
+            ]
+
+            outputs = np.asarray(self.forward(np.concatenate(samples, axis=0)))
+
+            if len(outputs) != len(items):
+                raise ValueError(f"forward returned {len(outputs)} rows for {len(items)} inputs")
+
+            for i, (_, future) in enumerate(items):
+                future.set_result(outputs[i])
+
+        except Exception as e:
+            logging.error(f"Batched inference failed ({len(items)} inputs): {e}")
+
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
@@ -0,0 +1,174 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+# =====================================================
+# 🔥 CONTENT-ADDRESSED INFERENCE RESULT CACHE
+# =====================================================
+#
+# Key = sha256(image bytes) + sensor set fingerprint (batch Merkle
+# root) + model version. Same image, same readings, same models ->
+# same result, so retries and dashboard re-triggers skip inference.
+
+def image_digest(image_file, chunk_size=1 << 20):
+    """
+    sha256 of an uploaded file's content (stream position restored to 0).
+    """
+
+    digest = hashlib.sha256()
+    image_file.seek(0)
+
+    for chunk in iter(lambda: image_file.read(chunk_size), b""):
+        digest.update(chunk)
+
+    image_file.seek(0)
+    return digest.hexdigest()
+
+
+def make_cache_key(image_hash, sensor_fingerprint, model_version):
+    raw = f"{image_hash}:{sensor_fingerprint}:{model_version}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class InferenceCache:
+    """
+    Bounded in-memory LRU of AI results with an optional on-disk tier
+    (one JSON file per key) that survives restarts and is shared by
+    workers on the same host.
+
+    The disk tier is bounded too: files older than disk_ttl seconds are
+    misses, and a periodic prune (every ~10% of disk_max_entries writes)
+    drops expired files and then the least recently used beyond
+    disk_max_entries (a disk hit refreshes the file's mtime).
+    """
+
+    def __init__(self, max_entries=1024, disk_dir=None, disk_max_entries=10000, disk_ttl=None):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.disk_max_entries = disk_max_entries
+        self.disk_ttl = disk_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._prune_every = max(1, disk_max_entries // 10)
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self.prune_disk()
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def get(self, key):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                return copy.deepcopy(result)
+
+        if not self.disk_dir:
+            return None
+
+        path = self._disk_path(key)
+
+        try:
+            if self.disk_ttl and time.time() - os.path.getmtime(path) > self.disk_ttl:
+                return None
+
+            with open(path, "r") as f:
+                result = json.load(f)
+
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        self._remember(key, result)
+        return copy.deepcopy(result)
+
+    def put(self, key, result):
+        self._remember(key, copy.deepcopy(result))
+
+        if not self.disk_dir:
+            return
+
+        # Atomic write so concurrent workers never read partial files
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(result, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"Inference cache disk write failed: {e}")
+            return
+
+        with self._lock:
+            self._writes_since_prune += 1
+            due = self._writes_since_prune >= self._prune_every
+            if due:
+                self._writes_since_prune = 0
+
+        if due:
+            self.prune_disk()
+
+    def prune_disk(self):
+        """
+        Drop expired files, then the oldest beyond disk_max_entries.
+        Returns the number of files removed.
+        """
+
+        now = time.time()
+        entries = []
+        removed = 0
+
+        try:
+            names = os.listdir(self.disk_dir)
+        except OSError:
+            return 0
+
+        for name in names:
+            path = os.path.join(self.disk_dir, name)
+
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+
+            expired = self.disk_ttl and now - mtime > self.disk_ttl
+            # Leftover temp files from a crashed writer
+            stale_tmp = name.endswith(".tmp") and now - mtime > 60
+
+            if expired or stale_tmp:
+                removed += self._unlink(path)
+            elif name.endswith(".json"):
+                entries.append((mtime, path))
+
+        if self.disk_max_entries and len(entries) > self.disk_max_entries:
+            entries.sort()
+            for _, path in entries[:len(entries) - self.disk_max_entries]:
+                removed += self._unlink(path)
+
+        return removed
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.remove(path)
+            return 1
+        except OSError:
+            return 0
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
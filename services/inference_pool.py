@@ -0,0 +1,159 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+import numpy as np
+
+
+# =====================================================
+# 🔥 OUT-OF-PROCESS INFERENCE POOL
+# =====================================================
+#
+# Models live in a fixed number of inference processes instead of in
+# every web worker. Image tensors go through multiprocessing.shared_memory
+# (only the block name, shape and dtype are pickled); outputs are a few
+# floats per sample and are returned normally.
+
+def _attach_shared_memory(name):
+    # Python 3.13+: the creating process owns cleanup, don't track here
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+# -------------------------------------------------
+# 🔹 Worker side (runs inside the spawned processes)
+# -------------------------------------------------
+
+def _init_worker():
+    from services import ai_service
+
+    ai_service.mark_inference_worker()
+    ai_service.load_and_warm_models()
+
+
+def _worker_model_status():
+    from services import ai_service
+
+    return ai_service.models_ready(), ai_service.model_status()
+
+
+def _worker_predict_images(shm_name, shape, dtype):
+    from services import ai_service
+
+    shm = _attach_shared_memory(shm_name)
+
+    try:
+        batch = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        prediction = np.array(ai_service.run_tomato_model_local(batch))
+        del batch
+    finally:
+        shm.close()
+
+    return prediction
+
+
+def _worker_score_environment(features):
+    from services import ai_service
+
+    return ai_service.score_environment(features)
+
+
+# -------------------------------------------------
+# 🔹 Web worker side
+# -------------------------------------------------
+
+class InferencePool:
+    """
+    ProcessPoolExecutor of `workers` spawned inference processes, each
+    loading and warming the models once in its initializer. Calls wait
+    at most `timeout` seconds (queueing included) for a result, so a hung
+    process can't hold request threads forever.
+    """
+
+    def __init__(self, workers, timeout=None):
+        self.workers = workers
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._executor = self._new_executor()
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        )
+
+    def _submit(self, fn, *args):
+        # A crashed inference process breaks the whole executor; start
+        # a fresh one instead of failing every later request
+        try:
+            return self._executor.submit(fn, *args)
+        except BrokenProcessPool:
+            with self._lock:
+                executor = self._executor
+
+                try:
+                    return executor.submit(fn, *args)
+                except BrokenProcessPool:
+                    logging.warning("Inference pool broken, restarting processes")
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = self._new_executor()
+
+            return self._executor.submit(fn, *args)
+
+    def predict_images(self, batch):
+        """
+        Forward pass of the grading model over an (N, 224, 224, 3) batch.
+        """
+
+        batch = np.ascontiguousarray(batch, dtype=np.float32)
+        shm = shared_memory.SharedMemory(create=True, size=max(batch.nbytes, 1))
+
+        try:
+            np.ndarray(batch.shape, dtype=batch.dtype, buffer=shm.buf)[...] = batch
+
+            future = self._submit(
+                _worker_predict_images, shm.name, batch.shape, batch.dtype.str
+            )
+            return self._result(future)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def score_environment(self, features):
+        return self._result(self._submit(_worker_score_environment, features))
+
+    def _result(self, future):
+        try:
+            return future.result(timeout=self.timeout)
+        except FuturesTimeoutError:
+            future.cancel()
+            logging.error(f"❌ Inference process gave no result within {self.timeout}s")
+            raise
+
+    def warm(self, timeout=None):
+        """
+        Start every inference process and collect (ready, model_status)
+        from each one.
+        """
+
+        futures = [self._submit(_worker_model_status) for _ in range(self.workers)]
+        done, _ = wait(futures, timeout=timeout)
+
+        results = []
+        for future in done:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logging.error(f"❌ Inference process failed to start: {e}")
+                results.append((False, {}))
+
+        return results
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,194 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from database.db import db
+from services.ingest_service import store_sensor_readings
+
+
+# =====================================================
+# 🔥 WRITE-BEHIND INGESTION BUFFER
+# =====================================================
+
+class IngestBuffer:
+    """
+    Bounded in-memory queue of parsed sensor rows.
+
+    A background flusher writes queued rows to sensor_readings when
+    flush_rows are waiting or the oldest row has waited
+    flush_interval_ms, whichever comes first. submit() returns False
+    when the queue is full so the route can answer 429.
+    """
+
+    def __init__(self, app, max_rows=10000, flush_rows=500, flush_interval_ms=200):
+        self.app = app
+        self.max_rows = max_rows
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval_ms / 1000.0
+
+        self._rows = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = None
+        self._pid = None
+
+    # -------------------------------------------------
+    # 🔹 Producer side (request threads)
+    # -------------------------------------------------
+
+    def submit(self, batch_pk, rows):
+        """
+        Enqueue all rows for one batch, or none of them.
+        """
+
+        with self._cond:
+            if self._closed or len(self._rows) + len(rows) > self.max_rows:
+                return False
+
+            self._ensure_started()
+
+            was_empty = not self._rows
+            enqueued_at = time.monotonic()
+            for row in rows:
+                self._rows.append((enqueued_at, batch_pk, row))
+
+            # Wake the flusher to start the deadline for the first row
+            # (it sleeps untimed on an empty queue) or when a chunk is full
+            if was_empty or len(self._rows) >= self.flush_rows:
+                self._cond.notify()
+
+        return True
+
+    def pending(self):
+        with self._cond:
+            return len(self._rows)
+
+    def _ensure_started(self):
+        # Started lazily so pre-fork servers get a flusher per worker
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+
+        self._pid = os.getpid()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="sensor-ingest-flusher",
+            daemon=True
+        )
+        self._thread.start()
+
+    # -------------------------------------------------
+    # 🔹 Consumer side (flusher thread)
+    # -------------------------------------------------
+
+    def _next_chunk(self):
+        with self._cond:
+            while not self._rows and not self._closed:
+                self._cond.wait()
+
+            if not self._rows:
+                return None
+
+            deadline = self._rows[0][0] + self.flush_interval
+
+            while len(self._rows) < self.flush_rows and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            count = min(len(self._rows), self.flush_rows)
+            return [self._rows.popleft() for _ in range(count)]
+
+    def _run(self):
+        while True:
+            chunk = self._next_chunk()
+
+            if chunk is None:
+                return
+
+            self._flush(chunk)
+
+    def _flush(self, chunk):
+        grouped = {}
+        for _, batch_pk, row in chunk:
+            grouped.setdefault(batch_pk, []).append(row)
+
+        with self.app.app_context():
+            try:
+                for batch_pk, rows in grouped.items():
+                    store_sensor_readings(batch_pk, rows)
+                db.session.commit()
+                return
+
+            except Exception as e:
+                db.session.rollback()
+                logging.error(f"Ingest flush failed, retrying per batch: {e}")
+
+            # Isolate the failing batch (e.g. deleted meanwhile) so the
+            # rest of the chunk still lands
+            for batch_pk, rows in grouped.items():
+                try:
+                    store_sensor_readings(batch_pk, rows)
+                    db.session.commit()
+                except Exception as e:
+                    db.session.rollback()
+                    logging.error(
+                        f"❌ Dropped {len(rows)} buffered readings for batch pk={batch_pk}: {e}"
+                    )
+
+    # -------------------------------------------------
+    # 🔹 Shutdown (drain everything still queued)
+    # -------------------------------------------------
+
+    def shutdown(self, timeout=30):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+            thread = self._thread
+            if thread is None or self._pid != os.getpid():
+                # No live flusher in this process: drain inline
+                thread = None
+
+        if thread is not None:
+            thread.join(timeout)
+            return
+
+        while True:
+            chunk = self._next_chunk()
+            if chunk is None:
+                return
+            self._flush(chunk)
+
+
+# =====================================================
+# 🔹 APP WIRING
+# =====================================================
+
+def init_ingest_buffer(app):
+    """
+    Attach an IngestBuffer to the app when SENSOR_WRITE_BEHIND is on.
+    """
+
+    if not app.config.get("SENSOR_WRITE_BEHIND"):
+        return None
+
+    buffer = IngestBuffer(
+        app,
+        max_rows=app.config["SENSOR_BUFFER_MAX_ROWS"],
+        flush_rows=app.config["SENSOR_FLUSH_ROWS"],
+        flush_interval_ms=app.config["SENSOR_FLUSH_INTERVAL_MS"]
+    )
+
+    app.extensions["ingest_buffer"] = buffer
+    atexit.register(buffer.shutdown)
+
+    logging.info("✅ Write-behind sensor ingestion enabled")
+
+    return buffer
+
+
+def get_ingest_buffer(app):
+    return app.extensions.get("ingest_buffer")
@@ -0,0 +1,120 @@
+from datetime import datetime
+from sqlalchemy import insert
+from database.db import db
+from models.sensor_model import SensorReading
+from services.aggregate_service import apply_readings_to_aggregates
+from services.merkle_service import lock_batch_frontier, append_to_frontier
+from utils.hash_utils import hash_sensor_reading, hash_sensor_readings
+
+
+# =====================================================
+# 🔹 PAYLOAD SCHEMA (ESP32 / IoT DEVICE)
+# =====================================================
+
+REQUIRED_FIELDS = ["N", "P", "K", "temperature", "humidity"]
+
+FIELD_COLUMNS = {
+    "N": "nitrogen",
+    "P": "phosphorus",
+    "K": "potassium",
+    "temperature": "temperature",
+    "humidity": "humidity"
+}
+
+
+# =====================================================
+# 🔹 VALIDATE + HASH ONE READING
+# =====================================================
+
+def parse_sensor_payload(data, with_hash=True):
+    """
+    Validate a device payload and map it to SensorReading columns.
+    Raises ValueError with a client-facing message when invalid.
+    with_hash=False leaves data_hash to the caller (batched hashing).
+    """
+
+    if not isinstance(data, dict) or not data:
+        raise ValueError("Invalid JSON payload")
+
+    for field in REQUIRED_FIELDS:
+        if field not in data:
+            raise ValueError(f"{field} is required")
+
+    row = {}
+
+    for field, column in FIELD_COLUMNS.items():
+        try:
+            row[column] = float(data[field])
+        except (TypeError, ValueError):
+            raise ValueError(f"{field} must be numeric")
+
+    # Integrity hash is always taken over the raw device payload
+    if with_hash:
+        row["data_hash"] = hash_sensor_reading(data)
+    row["created_at"] = datetime.utcnow()
+
+    return row
+
+
+# =====================================================
+# 🔹 VALIDATE + HASH MANY READINGS
+# =====================================================
+
+def parse_sensor_payloads(items):
+    """
+    Validate a list of device payloads and hash the valid ones in
+    one batched pass. Returns (rows, results) where results holds a
+    per-item status in input order.
+    """
+
+    rows = []
+    payloads = []
+    results = []
+
+    for index, item in enumerate(items):
+        try:
+            row = parse_sensor_payload(item, with_hash=False)
+        except ValueError as e:
+            results.append({"index": index, "status": "rejected", "error": str(e)})
+            continue
+
+        rows.append(row)
+        payloads.append(item)
+        results.append({"index": index, "status": "stored"})
+
+    stored = [result for result in results if result["status"] == "stored"]
+
+    for row, result, data_hash in zip(rows, stored, hash_sensor_readings(payloads)):
+        row["data_hash"] = result["data_hash"] = data_hash
+
+    return rows, results
+
+
+# =====================================================
+# 🔥 MULTI-ROW INSERT (caller owns the commit)
+# =====================================================
+
+def store_sensor_readings(batch_pk, rows):
+    """
+    Insert parsed readings for one batch with a single
+    executemany INSERT, extend the batch Merkle frontier and
+    update the running sensor aggregates. Does not commit.
+    """
+
+    if not rows:
+        return 0
+
+    # Lock first: concurrent writers to the same batch serialize here,
+    # so frontier leaf order matches reading id order
+    frontier = lock_batch_frontier(batch_pk)
+
+    apply_readings_to_aggregates(batch_pk, rows)
+
+    db.session.execute(
+        insert(SensorReading),
+        [dict(row, batch_id=batch_pk) for row in rows]
+    )
+
+    append_to_frontier(frontier, [row["data_hash"] for row in rows])
+
+    return len(rows)
@@ -1,6 +1,8 @@
 import os
+import threading
 import requests
 from dotenv import load_dotenv
+from services.pinata_client import PinataClient
 
 load_dotenv()
 
@@ -14,13 +16,26 @@ PINATA_SECRET_API_KEY = os.getenv("PINATA_SECRET_KEY")
 if not PINATA_API_KEY or not PINATA_SECRET_API_KEY:
     raise Exception("Pinata API keys not found in environment variables.")
 
-PIN_JSON_URL = "https://api.pinata.cloud/pinning/pinJSONToIPFS"
-PIN_FILE_URL = "https://api.pinata.cloud/pinning/pinFileToIPFS"
 
-HEADERS = {
-    "pinata_api_key": PINATA_API_KEY,
-    "pinata_secret_api_key": PINATA_SECRET_API_KEY
-}
+# =====================================================
+# 🔹 SHARED CLIENT (one pooled session per process)
+# =====================================================
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_pinata_client():
+    global _client, _client_pid
+
+    with _client_lock:
+        # Sockets must not be shared with forked workers
+        if _client is None or _client_pid != os.getpid():
+            _client_pid = os.getpid()
+            _client = PinataClient(PINATA_API_KEY, PINATA_SECRET_API_KEY)
+
+    return _client
 
 
 # =====================================================
@@ -33,28 +48,7 @@ def upload_json_to_ipfs(data, name="batch_metadata"):
     """
 
     try:
-        payload = {
-            "pinataMetadata": {
-                "name": name
-            },
-            "pinataContent": data
-        }
-
-        response = requests.post(
-            PIN_JSON_URL,
-            json=payload,
-            headers=HEADERS,
-            timeout=20
-        )
-
-        response.raise_for_status()
-
-        cid = response.json().get("IpfsHash")
-
-        if not cid:
-            raise Exception("CID not returned from Pinata")
-
-        return cid
+        return get_pinata_client().pin_json(data, name=name)
 
     except requests.exceptions.RequestException as e:
         raise Exception(f"IPFS JSON upload failed: {str(e)}")
@@ -70,25 +64,7 @@ def upload_file_to_ipfs(file_obj, filename="leaf_image.jpg"):
     """
 
     try:
-        files = {
-            "file": (filename, file_obj)
-        }
-
-        response = requests.post(
-            PIN_FILE_URL,
-            files=files,
-            headers=HEADERS,
-            timeout=30
-        )
-
-        response.raise_for_status()
-
-        cid = response.json().get("IpfsHash")
-
-        if not cid:
-            raise Exception("CID not returned from Pinata")
-
-        return cid
+        return get_pinata_client().pin_file(file_obj, filename=filename)
 
     except requests.exceptions.RequestException as e:
         raise Exception(f"IPFS file upload failed: {str(e)}")
@@ -108,15 +84,13 @@ def get_ipfs_gateway_url(cid):
 
 def safe_upload_json(data, retries=2):
     """
-    Retry JSON upload if it fails
+    Retry JSON upload if it fails (exponential backoff with jitter)
     """
 
-    for attempt in range(retries + 1):
-        try:
-            return upload_json_to_ipfs(data)
-        except Exception:
-            if attempt == retries:
-                raise
+    try:
+        return get_pinata_client().pin_json(data, retries=retries)
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"IPFS JSON upload failed: {str(e)}")
 
 
 # =====================================================
@@ -0,0 +1,187 @@
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+# =====================================================
+# 🌳 NATIVE SHA-256 MERKLE ENGINE (bytes level)
+# =====================================================
+#
+# Levels are packed `bytes`: n leaves -> n * 32 bytes. Two siblings
+# are adjacent in memory, so a parent is sha256 over one 64-byte
+# memoryview slice: no hex round-trips, no per-node concatenation.
+#
+# Tree shape matches MerkleTools: pair left to right, an odd last
+# node is promoted unchanged to the next level.
+
+HASH_SIZE = 32
+PAIR_SIZE = 2 * HASH_SIZE
+
+# Above this many leaves, levels are built across a process pool
+PARALLEL_THRESHOLD = 1 << 20
+
+
+def hex_leaves(hashes):
+    """
+    Pack leaves for hex data_hashes exactly like
+    MerkleTools.add_leaf(h, True): sha256 of the hex string.
+    """
+
+    sha256 = hashlib.sha256
+    return b"".join([sha256(h.encode("utf-8")).digest() for h in hashes])
+
+
+def pack_leaves(leaves):
+    """
+    Pack raw 32-byte leaves (bytes / bytearray / memoryview).
+    """
+
+    return b"".join(leaves)
+
+
+def next_level(level):
+    """
+    Hash one packed level into its parent level.
+    """
+
+    view = memoryview(level)
+    count = len(view) // HASH_SIZE
+    end = (count // 2) * PAIR_SIZE
+    sha256 = hashlib.sha256
+
+    parents = b"".join([
+        sha256(view[i:i + PAIR_SIZE]).digest()
+        for i in range(0, end, PAIR_SIZE)
+    ])
+
+    if count % 2:
+        parents += view[end:end + HASH_SIZE]
+
+    return parents
+
+
+def _cpu_count():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _build_levels_serial(leaves):
+    level = bytes(leaves)
+    levels = [level]
+
+    while len(level) > HASH_SIZE:
+        level = next_level(level)
+        levels.append(level)
+
+    return levels
+
+
+def _pool_context():
+    # Workers only run hashlib, fork avoids re-importing the app
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def _build_levels_parallel(leaves, workers):
+    count = len(leaves) // HASH_SIZE
+
+    # Power-of-two chunks are perfect subtrees, so every chunk's levels
+    # line up with the global levels until each chunk is one node
+    chunk_leaves = 1
+    while chunk_leaves * workers < count:
+        chunk_leaves <<= 1
+
+    chunk_bytes = chunk_leaves * HASH_SIZE
+    chunks = [leaves[i:i + chunk_bytes] for i in range(0, len(leaves), chunk_bytes)]
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+        chunk_levels = list(pool.map(_build_levels_serial, chunks))
+
+    height = max(len(levels) for levels in chunk_levels)
+    levels = []
+
+    for h in range(height):
+        # A short (last) chunk already reached its root: that node is
+        # the odd end of the level and is promoted unchanged
+        levels.append(b"".join(
+            chunk[h] if h < len(chunk) else chunk[-1]
+            for chunk in chunk_levels
+        ))
+
+    level = levels[-1]
+    while len(level) > HASH_SIZE:
+        level = next_level(level)
+        levels.append(level)
+
+    return levels
+
+
+def build_levels(leaves, workers=None):
+    """
+    All levels of the tree over packed leaves, leaves first, root last.
+    Batches above PARALLEL_THRESHOLD leaves are split across
+    `workers` processes (default: CPU count, 1 disables).
+    """
+
+    if not leaves:
+        return []
+
+    if len(leaves) % HASH_SIZE:
+        raise ValueError("Packed leaves must be a multiple of 32 bytes")
+
+    workers = workers or _cpu_count()
+
+    if workers > 1 and len(leaves) // HASH_SIZE > PARALLEL_THRESHOLD:
+        return _build_levels_parallel(bytes(leaves), workers)
+
+    return _build_levels_serial(leaves)
+
+
+def merkle_root(leaves, workers=None):
+    """
+    Root (32 bytes) over packed leaves, or None when empty.
+    """
+
+    if not leaves:
+        return None
+
+    if (workers or _cpu_count()) > 1 and len(leaves) // HASH_SIZE > PARALLEL_THRESHOLD:
+        return build_levels(leaves, workers)[-1]
+
+    # Serial path keeps only one level alive at a time
+    level = leaves
+    while len(level) > HASH_SIZE:
+        level = next_level(level)
+
+    return bytes(level)
+
+
+def merkle_proof(levels, index):
+    """
+    Proof for leaf `index` in MerkleTools.get_proof() format:
+    [{"left"|"right": sibling_hex}, ...] from leaf to root.
+    """
+
+    proof = []
+
+    for level in levels[:-1]:
+        count = len(level) // HASH_SIZE
+
+        # Promoted odd end node has no sibling on this level
+        if index == count - 1 and count % 2 == 1:
+            index //= 2
+            continue
+
+        if index % 2:
+            sibling = level[(index - 1) * HASH_SIZE:index * HASH_SIZE]
+            proof.append({"left": bytes(sibling).hex()})
+        else:
+            sibling = level[(index + 1) * HASH_SIZE:(index + 2) * HASH_SIZE]
+            proof.append({"right": bytes(sibling).hex()})
+
+        index //= 2
+
+    return proof
@@ -1,4 +1,10 @@
-from merkletools import MerkleTools
+import hashlib
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from database.db import db
+from models.merkle_model import BatchMerkleFrontier, BatchMerkleTree
+from models.sensor_model import SensorReading
+from services.sensor_query import batch_readings
+from services.merkle_engine import HASH_SIZE, build_levels, hex_leaves, merkle_proof, merkle_root
 
 
 def generate_merkle_root(hashes):
@@ -9,15 +15,7 @@ def generate_merkle_root(hashes):
     if not hashes:
         return None
 
-    mt = MerkleTools(hash_type="sha256")
-
-    # Add leaves
-    for h in hashes:
-        mt.add_leaf(h, True)  # True = already hashed
-
-    mt.make_tree()
-
-    return mt.get_merkle_root()
+    return merkle_root(hex_leaves(hashes)).hex()
 
 
 def generate_merkle_proof(hashes, target_hash):
@@ -28,14 +26,327 @@ def generate_merkle_proof(hashes, target_hash):
     if not hashes:
         return None
 
-    mt = MerkleTools(hash_type="sha256")
+    index = hashes.index(target_hash)
+    levels = build_levels(hex_leaves(hashes))
+
+    return merkle_proof(levels, index)
+
+
+# =====================================================
+# 🌳 INCREMENTAL MERKLE FRONTIER (append-only)
+# =====================================================
+#
+# The tree pairs nodes left to right and promotes an odd last node
+# unchanged (see merkle_engine). That tree is exactly the fold of the
+# perfect subtrees given by the binary decomposition of the leaf count, so
+# keeping only their roots (at most log2(n) of them) is enough to
+# append leaves and read the root without loading any readings.
+
+def leaf_hash(data_hash):
+    """
+    Leaf bytes exactly as MerkleTools.add_leaf(data_hash, True) stores them.
+    """
+
+    return hashlib.sha256(data_hash.encode("utf-8")).digest()
+
+
+def _unpack(packed):
+    return [packed[i:i + HASH_SIZE] for i in range(0, len(packed), HASH_SIZE)]
+
+
+def frontier_append(leaf_count, packed_frontier, leaves):
+    """
+    Append leaf hashes (bytes) to a frontier.
+    Returns (new_leaf_count, new_packed_frontier).
+    """
+
+    sha256 = hashlib.sha256
+    stack = _unpack(packed_frontier)
+
+    for node in leaves:
+        height = 0
+
+        # Merge with every equal-sized subtree on the right edge
+        while leaf_count >> height & 1:
+            node = sha256(stack.pop() + node).digest()
+            height += 1
+
+        stack.append(node)
+        leaf_count += 1
+
+    return leaf_count, b"".join(stack)
+
+
+def frontier_root(packed_frontier):
+    """
+    Fold the frontier right to left into the Merkle root (hex).
+    """
+
+    stack = _unpack(packed_frontier)
+
+    if not stack:
+        return None
+
+    sha256 = hashlib.sha256
+    node = stack[-1]
+
+    for left in reversed(stack[:-1]):
+        node = sha256(left + node).digest()
+
+    return node.hex()
+
+
+# =====================================================
+# 🔹 PER-BATCH FRONTIER PERSISTENCE
+# =====================================================
+
+def lock_batch_frontier(batch_pk):
+    """
+    Fetch the batch frontier row FOR UPDATE, creating (and seeding
+    from already stored readings) on first use. Lock it before
+    inserting readings so leaf order follows insert (id) order.
+    """
+
+    created = db.session.execute(
+        pg_insert(BatchMerkleFrontier)
+        .values(batch_id=batch_pk, leaf_count=0, frontier=b"")
+        .on_conflict_do_nothing(index_elements=["batch_id"])
+    ).rowcount
+
+    frontier = (
+        db.session.query(BatchMerkleFrontier)
+        .filter_by(batch_id=batch_pk)
+        .with_for_update()
+        .populate_existing()
+        .one()
+    )
+
+    if created:
+        # Batch predates the frontier: seed from existing readings
+        existing = db.session.query(SensorReading.data_hash).filter_by(
+            batch_id=batch_pk
+        ).order_by(SensorReading.id)
+
+        append_to_frontier(frontier, [h for (h,) in existing])
+
+    return frontier
+
+
+def append_to_frontier(frontier, data_hashes):
+    """
+    Append reading data_hashes to a locked BatchMerkleFrontier row.
+    """
+
+    if not data_hashes:
+        return frontier
+
+    frontier.leaf_count, frontier.frontier = frontier_append(
+        frontier.leaf_count,
+        frontier.frontier,
+        [leaf_hash(h) for h in data_hashes]
+    )
+
+    return frontier
+
+
+def _current_frontier(batch_pk):
+    # Fresh row: the identity map may hold an older copy
+    frontier = db.session.get(BatchMerkleFrontier, batch_pk, populate_existing=True)
+
+    if frontier is None:
+        frontier = lock_batch_frontier(batch_pk)
+
+    return frontier
+
+
+def get_batch_merkle_root(batch_pk):
+    """
+    Current Merkle root of a batch in O(log n), without loading readings.
+    Equal to generate_merkle_root() over its data_hashes in id order.
+    """
+
+    return frontier_root(_current_frontier(batch_pk).frontier)
+
+
+def load_readings_with_root(batch_pk):
+    """
+    (readings, merkle_root) for the readings the frontier covers: the
+    first leaf_count readings in id order, read with the frontier root
+    instead of rehashing them. Readings ingested after the frontier was
+    read come later in id order (writers serialize on the frontier
+    lock) and are left out.
+    """
+
+    frontier = _current_frontier(batch_pk)
+    leaf_count = frontier.leaf_count
+    root = frontier_root(frontier.frontier)
+
+    readings = batch_readings(batch_pk).limit(leaf_count).all() if leaf_count else []
+
+    if len(readings) != leaf_count:
+        # Readings deleted behind the frontier's back (retention only
+        # removes whole batches): hash what is actually stored
+        root = generate_merkle_root([r.data_hash for r in readings])
+
+    return readings, root
+
+
+# =====================================================
+# 🌳 STORED TREE LEVELS + PROOFS
+# =====================================================
+
+def build_tree_levels(hashes):
+    """
+    Build every tree level as packed bytes, leaves first, root last.
+    """
+
+    return build_levels(hex_leaves(hashes))
+
+
+def split_levels(packed, leaf_count):
+    """
+    Inverse of b"".join(levels) given the leaf count.
+    """
+
+    levels = []
+    offset = 0
+    count = leaf_count
+
+    while count:
+        size = count * HASH_SIZE
+        levels.append(packed[offset:offset + size])
+        offset += size
+        count = 0 if count == 1 else (count + 1) // 2
+
+    return levels
+
+
+def save_batch_tree(batch_pk, hashes):
+    """
+    Build and upsert the packed tree for a batch (caller commits).
+    `hashes` must be the batch data_hashes in reading id order.
+    """
+
+    levels = build_tree_levels(hashes)
+
+    if not levels:
+        return None
+
+    tree = db.session.get(BatchMerkleTree, batch_pk)
+
+    if tree is None:
+        tree = BatchMerkleTree(batch_id=batch_pk)
+        db.session.add(tree)
+
+    tree.leaf_count = len(hashes)
+    tree.merkle_root = levels[-1].hex()
+    tree.levels = b"".join(levels)
+
+    return tree
+
+
+def _batch_hashes(batch_pk):
+    return [h for (h,) in db.session.query(SensorReading.data_hash).filter_by(
+        batch_id=batch_pk
+    ).order_by(SensorReading.id)]
+
+
+def finalized_leaf_count(hashes, root):
+    """
+    Length of the prefix of `hashes` whose Merkle root is `root`
+    (readings ingested after finalization come last), or None.
+    """
+
+    if generate_merkle_root(hashes) == root:
+        return len(hashes)
+
+    leaf_count, packed = 0, b""
 
     for h in hashes:
-        mt.add_leaf(h, True)
+        leaf_count, packed = frontier_append(leaf_count, packed, [leaf_hash(h)])
 
-    mt.make_tree()
+        if frontier_root(packed) == root:
+            return leaf_count
 
-    index = hashes.index(target_hash)
-    proof = mt.get_proof(index)
+    return None
+
+
+def load_batch_tree(batch):
+    """
+    Stored tree for a batch. Caller commits.
+
+    Finalized batches (merkle_root set) keep the tree of the readings
+    that were finalized, stored and pinned; later readings never move
+    their proofs to a new root. Other batches are rebuilt when missing
+    or older than the frontier (readings added since).
+    Returns None when the batch has no readings. A finalized batch
+    whose readings no longer reproduce its root returns a tree whose
+    merkle_root differs from batch.merkle_root.
+    """
+
+    tree = db.session.get(BatchMerkleTree, batch.id)
+
+    if batch.merkle_root:
+        if tree is not None and tree.merkle_root == batch.merkle_root:
+            return tree
+
+        hashes = _batch_hashes(batch.id)
+        count = finalized_leaf_count(hashes, batch.merkle_root)
+
+        if count is None:
+            return tree or save_batch_tree(batch.id, hashes)
+
+        return save_batch_tree(batch.id, hashes[:count])
+
+    frontier = db.session.get(BatchMerkleFrontier, batch.id)
+
+    if tree is not None and (frontier is None or frontier.leaf_count == tree.leaf_count):
+        return tree
+
+    return save_batch_tree(batch.id, _batch_hashes(batch.id))
+
+
+def generate_batch_proofs(tree, data_hashes=None):
+    """
+    Proofs for many readings against a stored tree.
+    data_hashes=None returns proofs for every leaf of the tree; each
+    leaf is matched back to its reading's data_hash (None if that
+    reading is no longer stored).
+    Returns (proofs, missing).
+    """
+
+    levels = split_levels(memoryview(tree.levels), tree.leaf_count)
+    leaves = levels[0]
+
+    if data_hashes is None:
+        by_leaf = {}
+        for h in _batch_hashes(tree.batch_id):
+            by_leaf.setdefault(leaf_hash(h), h)
+
+        return [
+            {
+                "data_hash": by_leaf.get(bytes(leaves[i * HASH_SIZE:(i + 1) * HASH_SIZE])),
+                "index": i,
+                "proof": merkle_proof(levels, i)
+            }
+            for i in range(tree.leaf_count)
+        ], []
+
+    # Leaf -> first index (same as list.index on duplicates)
+    positions = {}
+    for i in range(tree.leaf_count):
+        positions.setdefault(bytes(leaves[i * HASH_SIZE:(i + 1) * HASH_SIZE]), i)
+
+    proofs = []
+    missing = []
+
+    for h in data_hashes:
+        index = positions.get(leaf_hash(h))
+
+        if index is None:
+            missing.append(h)
+            continue
+
+        proofs.append({"data_hash": h, "index": index, "proof": merkle_proof(levels, index)})
 
-    return proof
\ No newline at end of file
+    return proofs, missing
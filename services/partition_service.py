@@ -0,0 +1,242 @@
+import logging
+import re
+from datetime import date, datetime
+from sqlalchemy import text
+
+
+# =====================================================
+# 🔥 SENSOR READING PARTITIONS (monthly, on created_at)
+# =====================================================
+#
+# sensor_readings is range-partitioned by month (see migration
+# b3d9f5a1c7e2). Partitions are named sensor_readings_pYYYYMM and cover
+# [first of month, first of next month); sensor_readings_default catches
+# anything outside them. Creating partitions ahead of time keeps new
+# rows out of the default partition.
+
+PARENT_TABLE = "sensor_readings"
+DEFAULT_PARTITION = "sensor_readings_default"
+
+_PARTITION_NAME = re.compile(r"^sensor_readings_p(\d{4})(\d{2})$")
+
+# Serializes partition DDL between workers starting at the same time
+_ADVISORY_LOCK_KEY = 0x5E50_4A27
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{PARENT_TABLE}_p{month.year:04d}{month.month:02d}"
+
+
+def is_partitioned(conn):
+    return bool(conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :name AND pg_table_is_visible(c.oid))"
+    ), {"name": PARENT_TABLE}).scalar())
+
+
+def list_partitions(conn):
+    """
+    [(name, month or None, row estimate)] for attached partitions.
+    """
+
+    rows = conn.execute(text(
+        "SELECT child.relname, child.reltuples::bigint FROM pg_inherits i "
+        "JOIN pg_class parent ON parent.oid = i.inhparent "
+        "JOIN pg_class child ON child.oid = i.inhrelid "
+        "WHERE parent.relname = :name AND pg_table_is_visible(parent.oid) "
+        "ORDER BY child.relname"
+    ), {"name": PARENT_TABLE}).all()
+
+    partitions = []
+    for name, estimate in rows:
+        match = _PARTITION_NAME.match(name)
+        month = date(int(match.group(1)), int(match.group(2)), 1) if match else None
+        partitions.append((name, month, max(estimate, 0)))
+
+    return partitions
+
+
+# -------------------------------------------------
+# 🔹 Create upcoming partitions
+# -------------------------------------------------
+
+def _create_month_partition(conn, month):
+    name = partition_name(month)
+    start, end = month, add_months(month, 1)
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+
+    has_default = conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": DEFAULT_PARTITION}).scalar()
+
+    stray_rows = has_default and conn.execute(text(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+        "WHERE created_at >= :start AND created_at < :end)"
+    ), {"start": start, "end": end}).scalar()
+
+    if not stray_rows:
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} {bounds}"))
+        return
+
+    # Rows for this month already sit in the default partition: move them
+    # into the new partition (Postgres refuses to create it otherwise)
+    conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+    conn.execute(text(f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} {bounds}"))
+    conn.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+        "WHERE created_at >= :start AND created_at < :end RETURNING *) "
+        f"INSERT INTO {PARENT_TABLE} SELECT * FROM moved"
+    ), {"start": start, "end": end})
+    conn.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+
+    logging.info(f"Moved default-partition rows into {name}")
+
+
+def ensure_partitions(conn, months_ahead=3, today=None):
+    """
+    Create monthly partitions from the current month through
+    months_ahead months ahead; returns the names created.
+    """
+
+    if not is_partitioned(conn):
+        return []
+
+    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+
+    existing = {name for name, _, _ in list_partitions(conn)}
+    current = month_start(today or datetime.utcnow())
+
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+
+        if partition_name(month) not in existing:
+            _create_month_partition(conn, month)
+            created.append(partition_name(month))
+
+    return created
+
+
+# -------------------------------------------------
+# 🔹 Retention (detach = archive table, drop = delete)
+# -------------------------------------------------
+
+def expired_partitions(conn, keep_months, today=None):
+    """
+    Monthly partitions entirely older than the last keep_months months.
+    """
+
+    cutoff = _retention_cutoff(keep_months, today)
+
+    return [
+        name for name, month, _ in list_partitions(conn)
+        if month is not None and add_months(month, 1) <= cutoff
+    ]
+
+
+def _retention_cutoff(keep_months, today=None):
+    return add_months(month_start(today or datetime.utcnow()), -keep_months)
+
+
+def _partition_batches(conn, name):
+    return {batch_id for (batch_id,) in conn.execute(text(f"SELECT DISTINCT batch_id FROM {name}"))}
+
+
+def retention_plan(conn, keep_months, today=None):
+    """
+    (removable, held) expired partitions. Retention works on whole
+    batches: a partition is held while any batch with readings in it
+    still has readings that stay (kept months, default partition, or
+    another held partition), so no batch ever loses part of its
+    readings (its frontier, tree, aggregates and pinned root describe
+    all of them).
+    """
+
+    cutoff = _retention_cutoff(keep_months, today)
+    expired = expired_partitions(conn, keep_months, today)
+
+    if not expired:
+        return [], []
+
+    # Everything at or after the cutoff stays, and so does the default
+    # partition (any date) since retention never touches it
+    staying = {batch_id for (batch_id,) in conn.execute(text(
+        f"SELECT DISTINCT batch_id FROM {PARENT_TABLE} WHERE created_at >= :cutoff "
+        f"OR tableoid = to_regclass('{DEFAULT_PARTITION}')"
+    ), {"cutoff": cutoff})}
+
+    batches = {name: _partition_batches(conn, name) for name in expired}
+    removable = set(expired)
+
+    # Holding a partition keeps its batches, which may hold others
+    changed = True
+    while changed:
+        changed = False
+
+        for name in sorted(removable):
+            if batches[name] & staying:
+                removable.discard(name)
+                staying |= batches[name]
+                changed = True
+
+    return (
+        [name for name in expired if name in removable],
+        [name for name in expired if name not in removable]
+    )
+
+
+def apply_retention(conn, keep_months, mode="detach", today=None):
+    """
+    Detach (keep as a standalone archive table) or drop expired
+    partitions whose batches have ended entirely (see retention_plan);
+    returns (affected, held) names.
+    """
+
+    if mode not in ("detach", "drop"):
+        raise ValueError("mode must be 'detach' or 'drop'")
+
+    if not is_partitioned(conn):
+        return [], []
+
+    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+
+    names, held = retention_plan(conn, keep_months, today)
+
+    for name in names:
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+
+        if mode == "drop":
+            conn.execute(text(f"DROP TABLE {name}"))
+
+    return names, held
+
+
+# -------------------------------------------------
+# 🔹 App startup hook
+# -------------------------------------------------
+
+def ensure_partitions_on_startup(engine, months_ahead):
+    """
+    Best effort: never block the app from starting.
+    """
+
+    if engine.dialect.name != "postgresql":
+        return
+
+    try:
+        with engine.begin() as conn:
+            created = ensure_partitions(conn, months_ahead)
+
+        if created:
+            logging.info(f"✅ Created sensor partitions: {', '.join(created)}")
+
+    except Exception as e:
+        logging.warning(f"⚠️ Sensor partition check skipped: {e}")
@@ -0,0 +1,359 @@
+import atexit
+import io
+import logging
+import os
+import queue
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import select
+from database.db import db
+from models.batch_model import SpinachBatch
+from models.pin_model import PendingMetadataPin
+from utils.ipfs_cid import canonical_json_bytes, compute_cid_v0
+
+
+# =====================================================
+# 🔥 LOCAL CID + BACKGROUND PINNING
+# =====================================================
+#
+# The metadata CID is computed locally from the canonical JSON bytes and
+# saved with the batch right away (pin_status "pending"); the same bytes
+# are pinned to Pinata afterwards. If Pinata reports another CID, the
+# batch is switched to the remote one ("reconciled") since that is what
+# the network actually serves.
+#
+# The bytes are stored in pending_metadata_pins in the same transaction
+# as the CID and deleted once pinned. A sweep (every
+# IPFS_PIN_RETRY_INTERVAL seconds, and `flask retry-pins`) re-pins rows
+# that are due, so restarts and Pinata outages only delay pinning.
+
+PIN_PENDING = "pending"
+PIN_PINNED = "pinned"
+PIN_RECONCILED = "reconciled"
+PIN_FAILED = "failed"
+
+
+class MetadataPin:
+    def __init__(self, cid, status, data=None, name=None):
+        self.cid = cid
+        self.status = status
+        self.data = data
+        self.name = name
+
+
+def prepare_metadata_pin(metadata, name="batch_metadata", local_cid=True):
+    """
+    CID for a metadata document: computed locally (pin later with
+    schedule_pin) or, when disabled / on failure, pinned synchronously.
+    """
+
+    if local_cid:
+        try:
+            data = canonical_json_bytes(metadata)
+            return MetadataPin(compute_cid_v0(data), PIN_PENDING, data, name)
+        except Exception as e:
+            logging.warning(f"Local CID computation failed, pinning synchronously: {e}")
+
+    from services.ipfs_service import upload_json_to_ipfs
+
+    return MetadataPin(upload_json_to_ipfs(metadata, name=name), PIN_PINNED)
+
+
+def _retry_delay(attempts):
+    config = current_app.config
+    return timedelta(seconds=min(
+        config["IPFS_PIN_RETRY_INTERVAL"] * 2 ** attempts,
+        config["IPFS_PIN_RETRY_MAX_DELAY"]
+    ))
+
+
+def save_pending_pin(batch_pk, pin):
+    """
+    Store a pending pin's bytes with the batch; call BEFORE committing
+    the batch's ipfs_cid (same transaction). First retry is one retry
+    delay away, giving the immediate background pin time to finish.
+    """
+
+    if pin.status != PIN_PENDING:
+        return None
+
+    row = db.session.get(PendingMetadataPin, batch_pk)
+
+    if row is None:
+        row = PendingMetadataPin(batch_id=batch_pk)
+        db.session.add(row)
+
+    row.cid = pin.cid
+    row.name = pin.name
+    row.data = pin.data
+    row.attempts = 0
+    row.last_error = None
+    row.next_attempt_at = datetime.utcnow() + _retry_delay(0)
+
+    return row
+
+
+def schedule_pin(app, batch_pk, pin):
+    """
+    Queue a pending pin; call AFTER committing the batch's ipfs_cid.
+    """
+
+    if pin.status != PIN_PENDING:
+        return
+
+    get_background_pinner(app).submit(batch_pk, pin)
+
+
+def record_pin_result(batch_pk, local_cid, remote_cid=None, error=None):
+    batch = db.session.get(SpinachBatch, batch_pk)
+    pending = db.session.get(PendingMetadataPin, batch_pk)
+
+    # Stored bytes of this document (not of a newer one)
+    if pending is not None and pending.cid != local_cid:
+        pending = None
+
+    # Batch deleted or re-finalized with a newer document meanwhile
+    if batch is None or batch.ipfs_cid != local_cid:
+        if pending is not None:
+            db.session.delete(pending)
+        db.session.commit()
+        return
+
+    if error is not None:
+        batch.pin_status = PIN_FAILED
+        logging.error(f"❌ Pinning {local_cid} for batch pk={batch_pk} failed: {error}")
+
+        if pending is not None:
+            pending.attempts += 1
+            pending.last_error = str(error)[:1000]
+            pending.next_attempt_at = datetime.utcnow() + _retry_delay(pending.attempts)
+
+        db.session.commit()
+        return
+
+    if remote_cid == local_cid:
+        batch.pin_status = PIN_PINNED
+    else:
+        batch.ipfs_cid = remote_cid
+        batch.pin_status = PIN_RECONCILED
+        logging.warning(
+            f"⚠️ CID mismatch for batch pk={batch_pk}: local {local_cid}, Pinata {remote_cid}; using Pinata's"
+        )
+
+    if pending is not None:
+        db.session.delete(pending)
+
+    db.session.commit()
+
+
+def pin_now(batch_pk, pin):
+    """
+    Upload a pending pin's bytes and record the outcome (app context).
+    Returns the error, or None when pinned.
+    """
+
+    from services.ipfs_service import get_pinata_client
+
+    remote_cid, error = None, None
+
+    try:
+        # Bytes must still be exactly what the advertised CID names
+        if compute_cid_v0(pin.data) != pin.cid:
+            raise ValueError("stored metadata bytes do not match the CID")
+
+        remote_cid = get_pinata_client().pin_file(
+            io.BytesIO(pin.data),
+            filename=f"{pin.name}.json",
+            name=pin.name,
+            cid_version=0
+        )
+    except Exception as e:
+        error = e
+
+    try:
+        record_pin_result(batch_pk, pin.cid, remote_cid, error)
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"❌ Could not record pin status for batch pk={batch_pk}: {e}")
+
+    return error
+
+
+def claim_due_pins(limit=100, include_not_due=False):
+    """
+    Stored pins due for a retry as [(batch_pk, MetadataPin)]. Claimed
+    rows are leased (next attempt pushed back) so other workers skip
+    them; a crashed attempt becomes due again when the lease ends.
+    """
+
+    now = datetime.utcnow()
+
+    stmt = (
+        select(PendingMetadataPin)
+        .order_by(PendingMetadataPin.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+
+    if not include_not_due:
+        stmt = stmt.where(PendingMetadataPin.next_attempt_at <= now)
+
+    claimed = []
+
+    for row in db.session.scalars(stmt):
+        row.next_attempt_at = now + _retry_delay(row.attempts)
+        claimed.append((row.batch_id, MetadataPin(row.cid, PIN_PENDING, bytes(row.data), row.name)))
+
+    db.session.commit()
+
+    return claimed
+
+
+# -------------------------------------------------
+# 🔹 Background pinner (worker threads)
+# -------------------------------------------------
+
+class BackgroundPinner:
+
+    def __init__(self, app, workers=2, retry_interval=0):
+        self.app = app
+        self.workers = workers
+        self.retry_interval = retry_interval
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._sweeper = None
+        self._stop = threading.Event()
+        self._pid = None
+
+    def submit(self, batch_pk, pin):
+        self.start()
+        self._queue.put((batch_pk, pin))
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def start(self):
+        """
+        Start (or restart, e.g. after a fork) the pin threads and the
+        retry sweeper.
+        """
+
+        if self._pid == os.getpid() and all(t.is_alive() for t in self._threads):
+            return
+
+        with self._lock:
+            if self._pid == os.getpid() and all(t.is_alive() for t in self._threads):
+                return
+
+            self._pid = os.getpid()
+            self._threads = [
+                threading.Thread(target=self._run, name=f"ipfs-pinner-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+
+            for thread in self._threads:
+                thread.start()
+
+            if self.retry_interval > 0:
+                self._sweeper = threading.Thread(target=self._sweep_loop, name="ipfs-pin-sweeper", daemon=True)
+                self._sweeper.start()
+
+    def sweep(self):
+        """
+        Queue stored pins that are due for a retry.
+        """
+
+        with self.app.app_context():
+            try:
+                claimed = claim_due_pins()
+            except Exception as e:
+                db.session.rollback()
+                logging.error(f"❌ Pin retry sweep failed: {e}")
+                return 0
+
+        for item in claimed:
+            self._queue.put(item)
+
+        return len(claimed)
+
+    def _sweep_loop(self):
+        # First sweep right away: picks up pins a restart interrupted
+        while True:
+            self.sweep()
+
+            if self._stop.wait(self.retry_interval):
+                return
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+
+            if item is None:
+                self._queue.task_done()
+                return
+
+            try:
+                self._pin(*item)
+            finally:
+                self._queue.task_done()
+
+    def _pin(self, batch_pk, pin):
+        with self.app.app_context():
+            pin_now(batch_pk, pin)
+
+    def shutdown(self, timeout=30):
+        """
+        Let queued pins finish (bounded) before the process exits.
+        """
+
+        if self._pid != os.getpid() or not self._threads:
+            return
+
+        self._stop.set()
+
+        for _ in self._threads:
+            self._queue.put(None)
+
+        for thread in self._threads:
+            thread.join(timeout)
+
+
+_pinner_lock = threading.Lock()
+
+
+def get_background_pinner(app):
+    with _pinner_lock:
+        pinner = app.extensions.get("ipfs_pinner")
+
+        if pinner is None:
+            pinner = BackgroundPinner(
+                app,
+                workers=app.config["IPFS_PIN_WORKERS"],
+                retry_interval=app.config["IPFS_PIN_RETRY_INTERVAL"]
+            )
+            app.extensions["ipfs_pinner"] = pinner
+            atexit.register(pinner.shutdown)
+
+    return pinner
+
+
+def init_background_pinner(app):
+    """
+    Start the pinner (and its retry sweeper) on the first request each
+    worker process serves, so stored pins left by a restart get retried
+    without waiting for a new upload. CLI commands never start it.
+    """
+
+    if app.config["IPFS_PIN_RETRY_INTERVAL"] <= 0:
+        return None
+
+    pinner = get_background_pinner(app)
+
+    @app.before_request
+    def start_background_pinner():
+        pinner.start()
+
+    return pinner
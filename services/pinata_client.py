@@ -0,0 +1,258 @@
+import asyncio
+import json
+import logging
+import random
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from config import Config
+
+
+# =====================================================
+# 🔥 PINATA HTTP CLIENTS (POOLED + RETRIES)
+# =====================================================
+#
+# Pinning is content-addressed (same payload -> same CID), so retrying
+# a POST that may already have succeeded is safe.
+
+PIN_JSON_PATH = "/pinning/pinJSONToIPFS"
+PIN_FILE_PATH = "/pinning/pinFileToIPFS"
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class PinataError(Exception):
+    pass
+
+
+def backoff_delay(attempt, base, cap, retry_after=None):
+    """
+    Exponential backoff with full jitter; a server Retry-After wins.
+    """
+
+    if retry_after is not None:
+        try:
+            return min(float(retry_after), cap)
+        except ValueError:
+            pass
+
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def _extract_cid(body):
+    cid = body.get("IpfsHash") if isinstance(body, dict) else None
+
+    if not cid:
+        raise PinataError("CID not returned from Pinata")
+
+    return cid
+
+
+def _file_options(name, cid_version):
+    fields = {}
+
+    if name:
+        fields["pinataMetadata"] = json.dumps({"name": name})
+    if cid_version is not None:
+        fields["pinataOptions"] = json.dumps({"cidVersion": cid_version})
+
+    return fields
+
+
+def _json_payload(data, name):
+    return {
+        "pinataMetadata": {
+            "name": name
+        },
+        "pinataContent": data
+    }
+
+
+# -------------------------------------------------
+# 🔹 Sync client (requests.Session + connection pool)
+# -------------------------------------------------
+
+class PinataClient:
+    """
+    One keep-alive session per process: TCP/TLS handshakes are reused,
+    at most `pool_size` connections per host.
+    """
+
+    def __init__(self, api_key, secret_key, base_url=None, pool_size=None,
+                 max_retries=None, backoff_base=None, backoff_max=None,
+                 connect_timeout=None, read_timeout=None):
+
+        self.base_url = (base_url or Config.PINATA_API_URL).rstrip("/")
+        self.max_retries = Config.PINATA_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = Config.PINATA_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = Config.PINATA_BACKOFF_MAX if backoff_max is None else backoff_max
+        self.timeout = (
+            Config.PINATA_CONNECT_TIMEOUT if connect_timeout is None else connect_timeout,
+            Config.PINATA_READ_TIMEOUT if read_timeout is None else read_timeout
+        )
+
+        pool_size = pool_size or Config.PINATA_POOL_SIZE
+
+        # Retries are handled below (with jitter), not by urllib3
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True, max_retries=0)
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "pinata_api_key": api_key,
+            "pinata_secret_api_key": secret_key
+        })
+
+    def _post(self, path, retries=None, rewind=None, **kwargs):
+        retries = self.max_retries if retries is None else retries
+        url = f"{self.base_url}{path}"
+
+        for attempt in range(retries + 1):
+            retry_after = None
+
+            try:
+                if rewind is not None:
+                    rewind()
+
+                response = self.session.post(url, timeout=self.timeout, **kwargs)
+
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return _extract_cid(response.json())
+
+                retry_after = response.headers.get("Retry-After")
+                error = PinataError(f"Pinata returned HTTP {response.status_code}")
+
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+
+            if attempt == retries:
+                raise error
+
+            delay = backoff_delay(attempt, self.backoff_base, self.backoff_max, retry_after)
+            logging.warning(f"Pinata request failed ({error}), retry {attempt + 1}/{retries} in {delay:.2f}s")
+            time.sleep(delay)
+
+    def pin_json(self, data, name="batch_metadata", retries=None):
+        return self._post(PIN_JSON_PATH, retries=retries, json=_json_payload(data, name))
+
+    def pin_file(self, file_obj, filename="leaf_image.jpg", retries=None, name=None, cid_version=None):
+        start = file_obj.tell() if hasattr(file_obj, "tell") else None
+        rewind = (lambda: file_obj.seek(start)) if start is not None else None
+
+        return self._post(
+            PIN_FILE_PATH,
+            retries=retries,
+            rewind=rewind,
+            files={"file": (filename, file_obj)},
+            data=_file_options(name, cid_version)
+        )
+
+    def close(self):
+        self.session.close()
+
+
+# -------------------------------------------------
+# 🔹 Async client (aiohttp, per-host connection limit)
+# -------------------------------------------------
+
+class AsyncPinataClient:
+    """
+    asyncio variant for bulk pinning:
+
+        async with AsyncPinataClient(key, secret) as client:
+            cids = await asyncio.gather(*(client.pin_json(d) for d in docs))
+    """
+
+    def __init__(self, api_key, secret_key, base_url=None, limit_per_host=None,
+                 max_retries=None, backoff_base=None, backoff_max=None,
+                 connect_timeout=None, read_timeout=None):
+
+        self.base_url = (base_url or Config.PINATA_API_URL).rstrip("/")
+        self.limit_per_host = limit_per_host or Config.PINATA_POOL_SIZE
+        self.max_retries = Config.PINATA_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = Config.PINATA_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = Config.PINATA_BACKOFF_MAX if backoff_max is None else backoff_max
+        self.connect_timeout = Config.PINATA_CONNECT_TIMEOUT if connect_timeout is None else connect_timeout
+        self.read_timeout = Config.PINATA_READ_TIMEOUT if read_timeout is None else read_timeout
+        self.headers = {
+            "pinata_api_key": api_key,
+            "pinata_secret_api_key": secret_key
+        }
+        self._session = None
+
+    async def __aenter__(self):
+        self._get_session()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _get_session(self):
+        # Created lazily so it binds to the running event loop
+        if self._session is None or self._session.closed:
+            import aiohttp
+
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit_per_host=self.limit_per_host),
+                timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+            )
+
+        return self._session
+
+    async def _post(self, path, make_kwargs, retries=None):
+        import aiohttp
+
+        retries = self.max_retries if retries is None else retries
+        url = f"{self.base_url}{path}"
+        session = self._get_session()
+
+        for attempt in range(retries + 1):
+            retry_after = None
+
+            try:
+                async with session.post(url, **make_kwargs()) as response:
+                    if response.status not in RETRY_STATUSES:
+                        response.raise_for_status()
+                        return _extract_cid(await response.json(content_type=None))
+
+                    retry_after = response.headers.get("Retry-After")
+                    error = PinataError(f"Pinata returned HTTP {response.status}")
+
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = e
+
+            if attempt == retries:
+                raise error
+
+            delay = backoff_delay(attempt, self.backoff_base, self.backoff_max, retry_after)
+            logging.warning(f"Pinata request failed ({error!r}), retry {attempt + 1}/{retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def pin_json(self, data, name="batch_metadata", retries=None):
+        payload = _json_payload(data, name)
+        return await self._post(PIN_JSON_PATH, lambda: {"json": payload}, retries)
+
+    async def pin_file(self, content, filename="leaf_image.jpg", retries=None, name=None, cid_version=None):
+        """
+        `content` is bytes (a fresh form is built for every attempt).
+        """
+
+        import aiohttp
+
+        def make_kwargs():
+            form = aiohttp.FormData()
+            form.add_field("file", content, filename=filename)
+
+            for field, value in _file_options(name, cid_version).items():
+                form.add_field(field, value)
+
+            return {"data": form}
+
+        return await self._post(PIN_FILE_PATH, make_kwargs, retries)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
@@ -0,0 +1,150 @@
+import csv
+import io
+import json
+import logging
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from database.db import db
+from models.sensor_model import SensorReading
+from services.sensor_query import batch_reading_filters
+
+
+# =====================================================
+# 🔥 STREAMING SENSOR EXPORT (flat memory)
+# =====================================================
+#
+# Readings are read through a server-side cursor (yield_per) in id order
+# and written out row by row, so a batch with millions of readings costs
+# the same worker memory as one with ten. `after` (last id received) lets
+# clients resume an interrupted download.
+
+EXPORT_FORMATS = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+CSV_COLUMNS = (
+    "id", "batch_id", "temperature", "humidity", "nitrogen", "phosphorus",
+    "potassium", "anomaly_detected", "predicted_disease", "health_score",
+    "data_hash", "created_at"
+)
+
+
+def iter_batch_readings(batch_pk, start=None, end=None, after_id=None, limit=None, chunk_size=1000):
+    """
+    Stream a batch's readings (to_dict() rows) in id order.
+    """
+
+    stmt = select(SensorReading).where(*batch_reading_filters(batch_pk, start, end))
+
+    if after_id is not None:
+        stmt = stmt.where(SensorReading.id > after_id)
+
+    stmt = stmt.order_by(SensorReading.id)
+
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    # Own session: the request's db.session is torn down when the view
+    # returns, while this generator is still being consumed by the server
+    with Session(db.engine) as session:
+        # yield_per -> stream_results (psycopg2 named cursor), fetched in chunks
+        result = session.execute(stmt.execution_options(yield_per=chunk_size))
+
+        try:
+            # Unmodified objects are weakly held by the session and freed
+            # as soon as each partition is serialized
+            for partition in result.scalars().partitions():
+                for reading in partition:
+                    yield reading.to_dict()
+        finally:
+            result.close()
+
+
+# -------------------------------------------------
+# 🔹 Encoders (generators of text chunks)
+# -------------------------------------------------
+
+def buffered(chunks, size=64 * 1024):
+    """
+    Coalesce small text chunks into ~size writes for the WSGI server.
+    """
+
+    pending = []
+    pending_size = 0
+
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_size += len(chunk)
+
+        if pending_size >= size:
+            yield "".join(pending)
+            pending = []
+            pending_size = 0
+
+    if pending:
+        yield "".join(pending)
+
+
+def _guarded(rows, on_error=None):
+    """
+    Log a mid-stream failure. Headers are gone already, so either report
+    it in-band (on_error) or re-raise: the server then aborts the
+    chunked response and the client sees an incomplete transfer instead
+    of a well-formed but truncated document.
+    """
+
+    try:
+        yield from rows
+    except Exception as e:
+        logging.error(f"❌ Sensor export aborted: {e}")
+
+        if on_error is None:
+            raise
+
+        on_error(str(e))
+
+
+def stream_json(batch_id, rows):
+    """
+    Same body as the old non-streaming endpoint:
+    {"batch_id": ..., "sensor_readings": [...]}.
+    """
+
+    yield '{"batch_id": %s, "sensor_readings": [' % json.dumps(batch_id)
+
+    separator = ""
+    for row in _guarded(rows):
+        yield separator + json.dumps(row)
+        separator = ", "
+
+    yield "]}\n"
+
+
+def stream_ndjson(rows):
+    errors = []
+
+    for row in _guarded(rows, errors.append):
+        yield json.dumps(row) + "\n"
+
+    for error in errors:
+        yield json.dumps({"error": error}) + "\n"
+
+
+def stream_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return value
+
+    writer.writerow(CSV_COLUMNS)
+    yield flush()
+
+    for row in _guarded(rows):
+        writer.writerow([row[column] for column in CSV_COLUMNS])
+        yield flush()
@@ -0,0 +1,33 @@
+from models.sensor_model import SensorReading
+
+
+# =====================================================
+# 🔹 PER-BATCH READING QUERIES
+# =====================================================
+#
+# Always filter on batch_id first (optionally a created_at range) so
+# the planner can use ix_sensor_readings_batch_id_created_at.
+
+def batch_reading_filters(batch_pk, start=None, end=None):
+    """
+    WHERE criteria for one batch; start inclusive, end exclusive.
+    """
+
+    criteria = [SensorReading.batch_id == batch_pk]
+
+    if start is not None:
+        criteria.append(SensorReading.created_at >= start)
+    if end is not None:
+        criteria.append(SensorReading.created_at < end)
+
+    return criteria
+
+
+def batch_readings(batch_pk, start=None, end=None):
+    """
+    Readings of one batch in insertion (Merkle leaf) order.
+    """
+
+    return SensorReading.query.filter(
+        *batch_reading_filters(batch_pk, start, end)
+    ).order_by(SensorReading.id)
@@ -0,0 +1,105 @@
+import re
+from datetime import datetime, timedelta
+from sqlalchemy import extract, func, select
+from database.db import db
+from models.sensor_model import SensorReading
+from services.sensor_query import batch_reading_filters
+from utils.downsample import lttb_indices
+
+
+# =====================================================
+# 🔥 BUCKETED SENSOR SERIES (charts)
+# =====================================================
+#
+# min / max / avg / count per time bucket computed in SQL, so a chart
+# needs a few hundred rows instead of every raw reading. Buckets are
+# aligned on the Unix epoch: floor(epoch / seconds) * seconds, which
+# works for any width (date_trunc only knows whole units).
+
+SERIES_FIELDS = ("temperature", "humidity", "nitrogen", "phosphorus", "potassium")
+
+BUCKET_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+_BUCKET_PATTERN = re.compile(r"^(\d+)([smhd])$")
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def parse_bucket(value):
+    """
+    "30s" / "5m" / "1h" / "1d" -> seconds.
+    """
+
+    match = _BUCKET_PATTERN.match(value or "")
+
+    if not match or int(match.group(1)) == 0:
+        raise ValueError("bucket must look like 30s, 5m, 1h or 1d")
+
+    return int(match.group(1)) * BUCKET_UNITS[match.group(2)]
+
+
+def parse_series_fields(value):
+    if not value:
+        return list(SERIES_FIELDS)
+
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in SERIES_FIELDS]
+
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    return fields
+
+
+def bucket_series(batch_pk, bucket_seconds, fields, start=None, end=None):
+    """
+    One row per non-empty bucket: (bucket_epoch, count, min/max/avg per field).
+    """
+
+    bucket = (func.floor(extract("epoch", SensorReading.created_at) / bucket_seconds) * bucket_seconds).label("bucket")
+
+    columns = [bucket, func.count(SensorReading.id)]
+    for field in fields:
+        column = getattr(SensorReading, field)
+        columns += [func.min(column), func.max(column), func.avg(column)]
+
+    stmt = (
+        select(*columns)
+        .where(*batch_reading_filters(batch_pk, start, end))
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+
+    return db.session.execute(stmt).all()
+
+
+def build_series(rows, fields, max_points=None):
+    """
+    Per-field point lists; with max_points, each field is reduced with
+    LTTB on its bucket averages (min/max/count of kept buckets intact).
+    """
+
+    times = [float(row[0]) for row in rows]
+    counts = [row[1] for row in rows]
+
+    series = {}
+    downsampled = bool(max_points) and len(rows) > max_points
+
+    for offset, field in enumerate(fields):
+        base = 2 + offset * 3
+        averages = [float(row[base + 2]) for row in rows]
+
+        indices = lttb_indices(times, averages, max_points) if downsampled else range(len(rows))
+
+        series[field] = [
+            {
+                "t": (_EPOCH + timedelta(seconds=times[i])).isoformat(),
+                "min": float(rows[i][base]),
+                "max": float(rows[i][base + 1]),
+                "avg": round(averages[i], 4),
+                "count": counts[i]
+            }
+            for i in indices
+        ]
+
+    return series, downsampled
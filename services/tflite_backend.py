@@ -0,0 +1,160 @@
+import logging
+import os
+import threading
+import numpy as np
+import tensorflow as tf
+
+
+# =====================================================
+# 🔥 TFLITE BACKEND FOR THE GRADING MODEL (CPU nodes)
+# =====================================================
+
+TFLITE_QUANTIZATIONS = ("float16", "int8")
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+def tflite_model_path(keras_path, quantization):
+    """
+    Cache location next to the Keras file, e.g. tomato_model.int8.tflite
+    """
+
+    root, _ = os.path.splitext(keras_path)
+    return f"{root}.{quantization}.tflite"
+
+
+# -------------------------------------------------
+# 🔹 Calibration data (int8 post-training quantization)
+# -------------------------------------------------
+
+def representative_dataset(preprocess, calibration_dir=None, max_samples=100, input_shape=(224, 224, 3)):
+    """
+    Yield calibration inputs for the int8 converter. Uses real images
+    from calibration_dir when given (strongly recommended), otherwise
+    random images, which only give a rough activation range.
+    """
+
+    paths = []
+    if calibration_dir and os.path.isdir(calibration_dir):
+        paths = sorted(
+            os.path.join(calibration_dir, name)
+            for name in os.listdir(calibration_dir)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )[:max_samples]
+
+    def generator():
+        if paths:
+            for path in paths:
+                with open(path, "rb") as f:
+                    yield [preprocess(f)]
+            return
+
+        logging.warning("⚠️ No TFLITE_CALIBRATION_DIR images, calibrating int8 on random data")
+        rng = np.random.default_rng(0)
+        for _ in range(max_samples):
+            yield [rng.uniform(0, 255, size=(1,) + input_shape).astype(np.float32)]
+
+    return generator
+
+
+# -------------------------------------------------
+# 🔹 One-time conversion
+# -------------------------------------------------
+
+def convert_to_tflite(keras_model, output_path, quantization, preprocess=None, calibration_dir=None):
+    if quantization not in TFLITE_QUANTIZATIONS:
+        raise ValueError(f"Unsupported TFLite quantization: {quantization}")
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+    if quantization == "float16":
+        converter.target_spec.supported_types = [tf.float16]
+    else:
+        # Full-integer kernels, float32 model inputs/outputs
+        converter.representative_dataset = representative_dataset(preprocess, calibration_dir)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+
+    tflite_bytes = converter.convert()
+
+    # Atomic write: concurrent workers may convert at the same time
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(tflite_bytes)
+    os.replace(tmp_path, output_path)
+
+    logging.info(f"✅ TFLite model written: {output_path} ({len(tflite_bytes) / 1e6:.1f} MB)")
+
+    return output_path
+
+
+# -------------------------------------------------
+# 🔹 Interpreter wrapper
+# -------------------------------------------------
+
+class TFLiteClassifier:
+    """
+    Thread-safe TFLite interpreter exposing the Keras
+    predict_on_batch() call used by ai_service.
+    """
+
+    def __init__(self, model_path, num_threads=None):
+        self.model_path = model_path
+        self._lock = threading.Lock()
+        self._interpreter = tf.lite.Interpreter(model_path=model_path, num_threads=num_threads)
+        self._interpreter.allocate_tensors()
+        self._input = self._interpreter.get_input_details()[0]
+        self._output = self._interpreter.get_output_details()[0]
+
+    def _quantize(self, batch, details):
+        scale, zero_point = details["quantization"]
+        if details["dtype"] in (np.int8, np.uint8) and scale:
+            info = np.iinfo(details["dtype"])
+            batch = np.clip(np.round(batch / scale + zero_point), info.min, info.max)
+        return batch.astype(details["dtype"])
+
+    def _dequantize(self, output, details):
+        scale, zero_point = details["quantization"]
+        if details["dtype"] in (np.int8, np.uint8) and scale:
+            return (output.astype(np.float32) - zero_point) * scale
+        return output
+
+    def predict_on_batch(self, batch):
+        batch = np.asarray(batch, dtype=np.float32)
+
+        with self._lock:
+            interpreter = self._interpreter
+
+            if tuple(self._input["shape"]) != batch.shape:
+                interpreter.resize_tensor_input(self._input["index"], batch.shape)
+                interpreter.allocate_tensors()
+                self._input = interpreter.get_input_details()[0]
+                self._output = interpreter.get_output_details()[0]
+
+            interpreter.set_tensor(self._input["index"], self._quantize(batch, self._input))
+            interpreter.invoke()
+
+            output = interpreter.get_tensor(self._output["index"])
+            return self._dequantize(output, self._output).copy()
+
+
+def load_tflite_classifier(keras_path, quantization, preprocess=None, calibration_dir=None, num_threads=None):
+    """
+    Load the cached TFLite artifact, converting from the Keras file
+    first when it is missing or older than the Keras model.
+    """
+
+    tflite_path = tflite_model_path(keras_path, quantization)
+
+    stale = (
+        not os.path.exists(tflite_path) or
+        os.path.getmtime(tflite_path) < os.path.getmtime(keras_path)
+    )
+
+    if stale:
+        logging.info(f"Converting {keras_path} to TFLite ({quantization})...")
+        keras_model = tf.keras.models.load_model(keras_path)
+        convert_to_tflite(keras_model, tflite_path, quantization, preprocess, calibration_dir)
+        del keras_model
+
+    return TFLiteClassifier(tflite_path, num_threads=num_threads)
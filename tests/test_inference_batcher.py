@@ -0,0 +1,70 @@
+import threading
+import time
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+import numpy as np
+import pytest
+from services.inference_batcher import InferenceBatcher
+
+
+def _double(batch):
+    return batch * 2
+
+
+def test_concurrent_samples_share_a_forward_pass():
+    calls = []
+
+    def forward(batch):
+        calls.append(len(batch))
+        return _double(batch)
+
+    batcher = InferenceBatcher(forward, max_batch_size=4, max_wait_ms=50)
+    futures = [batcher.submit(np.full((1, 2), i, dtype=np.float32)) for i in range(4)]
+
+    assert [f.result(2)[0] for f in futures] == [0, 2, 4, 6]
+    assert calls == [4]
+
+
+def test_short_output_fails_batch_and_dispatcher_survives():
+    batcher = InferenceBatcher(lambda batch: batch[:1], max_batch_size=2, max_wait_ms=50)
+    futures = [batcher.submit(np.ones((1, 2))) for _ in range(2)]
+
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result(2)
+
+    batcher.forward = _double
+    assert batcher.predict(np.ones((1, 2)), timeout=2).tolist() == [2, 2]
+
+
+def test_malformed_sample_fails_batch_and_dispatcher_survives():
+    batcher = InferenceBatcher(_double, max_batch_size=2, max_wait_ms=50)
+    futures = [batcher.submit(np.ones((1, 2))), batcher.submit(np.ones((1, 3)))]
+
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result(2)
+
+    assert batcher.predict(np.ones((1, 2)), timeout=2).tolist() == [2, 2]
+
+
+def test_predict_times_out_and_skips_cancelled_sample():
+    release = threading.Event()
+    seen = []
+
+    def forward(batch):
+        seen.append(batch[:, 0].tolist())
+        release.wait(2)
+        return batch
+
+    batcher = InferenceBatcher(forward, max_batch_size=1, max_wait_ms=0)
+
+    blocker = batcher.submit(np.array([[1.0]]))
+    time.sleep(0.1)
+
+    with pytest.raises(FuturesTimeoutError):
+        batcher.predict(np.array([[2.0]]), timeout=0.1)
+
+    release.set()
+    assert blocker.result(2).tolist() == [1.0]
+    assert batcher.predict(np.array([[3.0]]), timeout=2).tolist() == [3.0]
+    assert seen == [[1.0], [3.0]]
@@ -0,0 +1,71 @@
+import threading
+import time
+from services.ingest_buffer import IngestBuffer
+
+
+class RecordingBuffer(IngestBuffer):
+    """
+    IngestBuffer that records flushed chunks instead of writing them.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(app=None, **kwargs)
+        self.flushed = []
+        self.flushed_event = threading.Event()
+
+    def _flush(self, chunk):
+        self.flushed.append([row for _, _, row in chunk])
+        self.flushed_event.set()
+
+
+def _wait_for_flush(buffer, timeout=2):
+    assert buffer.flushed_event.wait(timeout), "nothing flushed"
+    buffer.flushed_event.clear()
+
+
+def test_trickle_rows_flush_after_interval():
+    buffer = RecordingBuffer(max_rows=1000, flush_rows=50, flush_interval_ms=100)
+
+    try:
+        # First chunk, then single readings well below flush_rows
+        buffer.submit(1, list(range(50)))
+        _wait_for_flush(buffer)
+
+        for value in ("a", "b"):
+            started = time.monotonic()
+            assert buffer.submit(1, [value])
+            _wait_for_flush(buffer)
+
+            assert time.monotonic() - started < 1
+            assert buffer.flushed[-1] == [value]
+            assert buffer.pending() == 0
+
+    finally:
+        buffer.shutdown(timeout=2)
+
+
+def test_full_chunk_flushes_before_interval():
+    buffer = RecordingBuffer(max_rows=1000, flush_rows=10, flush_interval_ms=5000)
+
+    try:
+        started = time.monotonic()
+        buffer.submit(1, list(range(10)))
+        _wait_for_flush(buffer)
+
+        assert time.monotonic() - started < 1
+        assert buffer.flushed == [list(range(10))]
+
+    finally:
+        buffer.shutdown(timeout=2)
+
+
+def test_submit_rejects_when_full_and_shutdown_drains():
+    buffer = RecordingBuffer(max_rows=5, flush_rows=100, flush_interval_ms=60000)
+
+    assert buffer.submit(1, [1, 2, 3])
+    assert not buffer.submit(2, [4, 5, 6])
+
+    buffer.shutdown(timeout=2)
+
+    assert buffer.flushed == [[1, 2, 3]]
+    assert buffer.pending() == 0
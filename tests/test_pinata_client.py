@@ -0,0 +1,177 @@
+import asyncio
+import io
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from services import pinata_client
+from services.pinata_client import AsyncPinataClient, PinataClient, PinataError, backoff_delay
+
+
+# -------------------------------------------------
+# 🔹 Local stand-in Pinata (scripted responses)
+# -------------------------------------------------
+
+class ScriptedPinata(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        server = self.server
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            status, headers = server.script.pop(0) if server.script else (200, {})
+
+        time.sleep(server.delay)
+
+        body = {"IpfsHash": "QmStandIn"} if status == 200 else {"error": "stand-in"}
+        raw = json.dumps(body).encode()
+
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+        with server.lock:
+            server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ScriptedPinata)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.script = []
+    server.delay = 0
+    server.requests = 0
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.url = f"http://127.0.0.1:{server.server_port}"
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server, **kwargs):
+    options = dict(base_url=server.url, pool_size=2, max_retries=3, backoff_base=0.01, backoff_max=0.05)
+    options.update(kwargs)
+    return PinataClient("key", "secret", **options)
+
+
+# -------------------------------------------------
+# 🔹 Backoff
+# -------------------------------------------------
+
+def test_backoff_is_full_jitter_capped(monkeypatch):
+    monkeypatch.setattr(pinata_client.random, "uniform", lambda low, high: high)
+
+    assert [backoff_delay(n, 0.5, 8) for n in range(6)] == [0.5, 1, 2, 4, 8, 8]
+    assert backoff_delay(0, 0.5, 8, retry_after="3") == 3
+    assert backoff_delay(0, 0.5, 8, retry_after="120") == 8
+    assert backoff_delay(1, 0.5, 8, retry_after="Wed, 21 Oct 2026 07:28:00 GMT") == 1
+
+
+# -------------------------------------------------
+# 🔹 Sync client
+# -------------------------------------------------
+
+def test_retries_5xx_then_succeeds(stand_in):
+    stand_in.script = [(503, {}), (502, {}), (200, {})]
+
+    assert _client(stand_in).pin_json({"a": 1}) == "QmStandIn"
+    assert stand_in.requests == 3
+
+
+def test_gives_up_after_max_retries(stand_in):
+    stand_in.script = [(500, {})] * 10
+
+    with pytest.raises(PinataError, match="HTTP 500"):
+        _client(stand_in, max_retries=2).pin_json({"a": 1})
+
+    assert stand_in.requests == 3
+
+
+def test_client_errors_are_not_retried(stand_in):
+    stand_in.script = [(400, {})]
+
+    with pytest.raises(requests.HTTPError):
+        _client(stand_in).pin_json({"a": 1})
+
+    assert stand_in.requests == 1
+
+
+def test_429_waits_for_retry_after(stand_in):
+    stand_in.script = [(429, {"Retry-After": "0.3"}), (200, {})]
+
+    started = time.monotonic()
+    assert _client(stand_in, backoff_max=5).pin_json({"a": 1}) == "QmStandIn"
+
+    assert time.monotonic() - started >= 0.3
+    assert stand_in.requests == 2
+
+
+def test_retry_after_is_capped_by_backoff_max(stand_in):
+    stand_in.script = [(429, {"Retry-After": "60"}), (200, {})]
+
+    started = time.monotonic()
+    assert _client(stand_in, backoff_max=0.1).pin_json({"a": 1}) == "QmStandIn"
+
+    assert time.monotonic() - started < 5
+
+
+def test_file_upload_is_rewound_between_attempts(stand_in):
+    stand_in.script = [(503, {}), (200, {})]
+    upload = io.BytesIO(b"leaf image bytes")
+
+    assert _client(stand_in).pin_file(upload) == "QmStandIn"
+    assert stand_in.requests == 2
+
+
+def test_pool_exhaustion_blocks_instead_of_opening_more_connections(stand_in):
+    stand_in.delay = 0.2
+    client = _client(stand_in, pool_size=1)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(3) as executor:
+        cids = list(executor.map(lambda i: client.pin_json({"i": i}), range(3)))
+
+    assert cids == ["QmStandIn"] * 3
+    assert stand_in.max_in_flight == 1
+    assert time.monotonic() - started >= 0.6
+
+
+# -------------------------------------------------
+# 🔹 Async client
+# -------------------------------------------------
+
+def test_async_client_retries_and_limits_per_host(stand_in):
+    stand_in.script = [(503, {}), (429, {"Retry-After": "0"})]
+    stand_in.delay = 0.05
+
+    async def pin_all():
+        async with AsyncPinataClient(
+            "key", "secret", base_url=stand_in.url, limit_per_host=2,
+            max_retries=3, backoff_base=0.01, backoff_max=0.05
+        ) as client:
+            return await asyncio.gather(*(client.pin_json({"i": i}) for i in range(4)))
+
+    assert asyncio.run(pin_all()) == ["QmStandIn"] * 4
+    assert stand_in.requests == 6
+    assert stand_in.max_in_flight <= 2
@@ -0,0 +1,41 @@
+from functools import wraps
+from flask import current_app, jsonify
+
+
+def require_ai_models(fn):
+    """
+    Return 503 (with per-model status) until the AI models are loaded
+    and warmed up, instead of blocking the request on model loading.
+    Always 503 in app profiles that do not serve inference.
+    """
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not current_app.config.get("AI_ENABLED", True):
+            response = jsonify({
+                "error": "AI inference is not served by this instance",
+                "profile": current_app.config.get("APP_PROFILE")
+            })
+            return response, 503
+
+        from services.ai_service import (
+            model_load_retry_after,
+            model_status,
+            models_ready,
+            start_background_model_loading
+        )
+
+        if not models_ready():
+            # No-op while a loader runs or a failed load is backing off
+            start_background_model_loading()
+
+            response = jsonify({
+                "error": "AI models are not ready yet",
+                "models": model_status()
+            })
+            response.headers["Retry-After"] = str(max(5, int(model_load_retry_after())))
+            return response, 503
+
+        return fn(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,54 @@
+# -------------------------------------------------------------------
+# 🔹 Largest-Triangle-Three-Buckets downsampling (Steinarsson, 2013)
+# -------------------------------------------------------------------
+# Keeps the first and last point and, from each of (threshold - 2)
+# equal buckets in between, the point forming the largest triangle with
+# the previously kept point and the average of the next bucket. Keeps
+# the visual shape (peaks / dips) of a series far better than striding.
+
+def lttb_indices(xs, ys, threshold):
+    """
+    Indices of the points to keep (ascending, len <= threshold).
+    """
+
+    n = len(xs)
+
+    if threshold >= n:
+        return list(range(n))
+
+    if threshold < 3:
+        raise ValueError("threshold must be at least 3")
+
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average point of the next bucket
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        span = next_end - next_start
+
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        # Point in this bucket with the largest triangle area
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+
+        ax, ay = xs[a], ys[a]
+        best_area = -1.0
+        best = start
+
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+
+        selected.append(best)
+        a = best
+
+    selected.append(n - 1)
+
+    return selected
@@ -2,13 +2,52 @@ import hashlib
 import json
 
 
+# -------------------------------------------------------------------
+# 🔹 Canonical encoder for the known ESP32 reading schema
+# -------------------------------------------------------------------
+# json.dumps(sort_keys=True) output for {"N", "P", "K", "temperature",
+# "humidity"} with plain int/float values, precompiled as a template.
+# Anything else (extra keys, strings, bools, NaN/inf) falls back to
+# json.dumps so digests stay byte-for-byte identical.
+
+_NUMBER_TYPES = frozenset((int, float))
+_READING_TEMPLATE = '{"K": %r, "N": %r, "P": %r, "humidity": %r, "temperature": %r}'
+
+
+def _canonical_reading(data):
+    if type(data) is dict and len(data) == 5:
+        values = (
+            data.get("K"),
+            data.get("N"),
+            data.get("P"),
+            data.get("humidity"),
+            data.get("temperature")
+        )
+
+        if (
+            type(values[0]) in _NUMBER_TYPES and
+            type(values[1]) in _NUMBER_TYPES and
+            type(values[2]) in _NUMBER_TYPES and
+            type(values[3]) in _NUMBER_TYPES and
+            type(values[4]) in _NUMBER_TYPES
+        ):
+            text = _READING_TEMPLATE % values
+
+            # repr gives nan/inf where json gives NaN/Infinity; no
+            # other lowercase "n" can appear in the template output
+            if "n" not in text:
+                return text
+
+    return json.dumps(data, sort_keys=True)
+
+
 def hash_sensor_reading(data):
     """
     Generate deterministic SHA256 hash for a sensor reading.
     """
 
-    # Sort keys to ensure consistent hashing
-    ordered_data = json.dumps(data, sort_keys=True)
+    # Sorted-key JSON (fast path for the known schema)
+    ordered_data = _canonical_reading(data)
 
     # Encode to bytes
     encoded_data = ordered_data.encode("utf-8")
@@ -19,6 +58,18 @@ def hash_sensor_reading(data):
     return hash_value
 
 
+def hash_sensor_readings(readings):
+    """
+    Hash many sensor readings in one pass.
+    Same digests as hash_sensor_reading(), returned in input order.
+    """
+
+    sha256 = hashlib.sha256
+    canonical = _canonical_reading
+
+    return [sha256(canonical(data).encode("utf-8")).hexdigest() for data in readings]
+
+
 def hash_batch_payload(batch_payload):
     """
     Hash entire batch JSON before IPFS upload
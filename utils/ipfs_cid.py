@@ -0,0 +1,147 @@
+import hashlib
+import json
+import multihash
+from cid import make_cid
+
+
+# =====================================================
+# 🔥 LOCAL IPFS CID (CIDv0, same as `ipfs add` / Pinata)
+# =====================================================
+#
+# Files are chunked into 256 KiB pieces, each wrapped in a UnixFS
+# "file" node inside a dag-pb block; more than one chunk is linked
+# through a balanced DAG with at most 174 links per node. The CID is
+# base58(sha2-256 multihash) of the root block.
+
+CHUNK_SIZE = 256 * 1024
+MAX_LINKS = 174
+
+UNIXFS_FILE = 2
+
+
+def canonical_json_bytes(data):
+    """
+    Deterministic bytes for metadata documents (these exact bytes are
+    pinned, so the local CID and Pinata's match).
+    """
+
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+# -------------------------------------------------
+# 🔹 Minimal protobuf encoding (dag-pb + UnixFS)
+# -------------------------------------------------
+
+def _varint(value):
+    out = bytearray()
+
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _field_varint(number, value):
+    return _varint(number << 3) + _varint(value)
+
+
+def _field_bytes(number, value):
+    return _varint((number << 3) | 2) + _varint(len(value)) + value
+
+
+def _unixfs_file(data=b"", filesize=0, blocksizes=()):
+    out = _field_varint(1, UNIXFS_FILE)
+
+    if data:
+        out += _field_bytes(2, data)
+
+    out += _field_varint(3, filesize)
+
+    for size in blocksizes:
+        out += _field_varint(4, size)
+
+    return out
+
+
+def _pb_node(unixfs, links=()):
+    # dag-pb canonical order: Links (2) before Data (1)
+    out = b""
+
+    for link_hash, link_tsize in links:
+        link = _field_bytes(1, link_hash) + _field_bytes(2, b"") + _field_varint(3, link_tsize)
+        out += _field_bytes(2, link)
+
+    return out + _field_bytes(1, unixfs)
+
+
+def _multihash(block):
+    return multihash.encode(hashlib.sha256(block).digest(), "sha2-256")
+
+
+# -------------------------------------------------
+# 🔹 Balanced DAG
+# -------------------------------------------------
+
+class _DagNode:
+    __slots__ = ("hash", "filesize", "tsize")
+
+    def __init__(self, block, filesize, children_tsize=0):
+        self.hash = _multihash(block)
+        self.filesize = filesize
+        self.tsize = len(block) + children_tsize
+
+
+def _leaf(chunk):
+    return _DagNode(_pb_node(_unixfs_file(chunk, len(chunk))), len(chunk))
+
+
+def _parent(children):
+    filesize = sum(child.filesize for child in children)
+    unixfs = _unixfs_file(filesize=filesize, blocksizes=[child.filesize for child in children])
+    block = _pb_node(unixfs, [(child.hash, child.tsize) for child in children])
+
+    return _DagNode(block, filesize, sum(child.tsize for child in children))
+
+
+def _fill(leaves, start, depth):
+    """
+    Subtree of `depth` over leaves[start:]; returns (node, next index).
+    """
+
+    if depth == 1:
+        children = leaves[start:start + MAX_LINKS]
+        return _parent(children), start + len(children)
+
+    children = []
+    index = start
+
+    while index < len(leaves) and len(children) < MAX_LINKS:
+        child, index = _fill(leaves, index, depth - 1)
+        children.append(child)
+
+    return _parent(children), index
+
+
+def compute_cid_v0(data, chunk_size=CHUNK_SIZE):
+    """
+    CIDv0 string ("Qm...") that `ipfs add` (default chunker, balanced
+    layout, no raw leaves) gives for `data`.
+    """
+
+    leaves = [_leaf(data[i:i + chunk_size]) for i in range(0, len(data), chunk_size)] or [_leaf(b"")]
+
+    if len(leaves) == 1:
+        root = leaves[0]
+    else:
+        depth = 1
+        while MAX_LINKS ** depth < len(leaves):
+            depth += 1
+
+        root, _ = _fill(leaves, 0, depth)
+
+    return str(make_cid(0, "dag-pb", root.hash))
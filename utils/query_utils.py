@@ -0,0 +1,73 @@
+import base64
+import json
+from datetime import datetime, timezone
+
+
+# -------------------------------------------------------------------
+# 🔹 Query-string parsing shared by list / export endpoints
+# -------------------------------------------------------------------
+# Helpers raise ValueError with a client-facing message; routes turn
+# that into a 400.
+
+def parse_datetime_param(value, name):
+    """
+    ISO 8601 date or datetime -> naive UTC datetime (how the DB stores it).
+    """
+
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an ISO 8601 date or datetime")
+
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return parsed
+
+
+def parse_time_range(args):
+    """
+    ?from=...&to=... -> (start, end); from is inclusive, to exclusive.
+    """
+
+    start = parse_datetime_param(args["from"], "from") if args.get("from") else None
+    end = parse_datetime_param(args["to"], "to") if args.get("to") else None
+
+    if start and end and start >= end:
+        raise ValueError("from must be earlier than to")
+
+    return start, end
+
+
+def parse_limit(args, default, maximum):
+    try:
+        limit = int(args.get("limit", default))
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+
+    if limit < 1:
+        raise ValueError("limit must be positive")
+
+    return min(limit, maximum)
+
+
+# -------------------------------------------------------------------
+# 🔹 Opaque keyset cursors
+# -------------------------------------------------------------------
+
+def encode_cursor(created_at, row_id):
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """
+    Cursor from encode_cursor() -> (created_at, id).
+    """
+
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
@@ -0,0 +1,286 @@
+import base64
+import itertools
+import struct
+import sys
+import zlib
+from array import array
+from datetime import datetime, timedelta
+from utils.hash_utils import hash_sensor_reading
+
+
+# =====================================================
+# 🔥 COMPACT COLUMNAR SENSOR ENCODING (IPFS METADATA)
+# =====================================================
+#
+# Replaces the list of reading dicts (every key repeated per reading)
+# with one column per field:
+#   - ids / created_at: first value + zigzag varint deltas
+#   - float fields: float64 (lossless, hashes stay verifiable),
+#     byte-shuffled so zlib sees the slowly changing exponent bytes together
+#   - health_score: float64, NaN for missing
+#   - anomaly_detected: bitmap
+#   - predicted_disease: string dictionary + indexes
+#   - data_hash: 32 raw bytes each
+# then zlib + base64 inside a small JSON envelope. decode_sensor_readings()
+# gives back exactly the SensorReading.to_dict() rows.
+
+FORMAT = "spinach-columnar-v1"
+
+FLOAT_FIELDS = ("temperature", "humidity", "nitrogen", "phosphorus", "potassium")
+
+# Raw ESP32 keys hashed at ingest (see ingest_service.FIELD_COLUMNS)
+DEVICE_FIELDS = (
+    ("N", "nitrogen"),
+    ("P", "phosphorus"),
+    ("K", "potassium"),
+    ("temperature", "temperature"),
+    ("humidity", "humidity")
+)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+# -------------------------------------------------
+# 🔹 Primitives
+# -------------------------------------------------
+
+def _write_varints(values, out):
+    for value in values:
+        value = (value << 1) ^ (value >> 63)  # zigzag
+
+        while value > 0x7F:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+
+        out.append(value)
+
+
+def _read_varints(buf, pos, count):
+    values = []
+
+    for _ in range(count):
+        shift = 0
+        value = 0
+
+        while True:
+            byte = buf[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+
+            if not byte & 0x80:
+                break
+
+        values.append((value >> 1) ^ -(value & 1))
+
+    return values, pos
+
+
+def _deltas(values):
+    previous = 0
+    out = []
+
+    for value in values:
+        out.append(value - previous)
+        previous = value
+
+    return out
+
+
+def _float_bytes(values):
+    column = array("d", values)
+    if sys.byteorder != "little":
+        column.byteswap()
+
+    raw = column.tobytes()
+
+    # Byte-shuffle: all first bytes, then all second bytes, ...
+    return b"".join(raw[i::8] for i in range(8))
+
+
+def _floats_from(buf, pos, count):
+    size = count * 8
+    shuffled = buf[pos:pos + size]
+
+    raw = bytearray(size)
+    for i in range(8):
+        raw[i::8] = shuffled[i * count:(i + 1) * count]
+
+    column = array("d")
+    column.frombytes(bytes(raw))
+    if sys.byteorder != "little":
+        column.byteswap()
+
+    return column.tolist(), pos + size
+
+
+def _to_micros(iso_value):
+    delta = datetime.fromisoformat(iso_value) - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+# -------------------------------------------------
+# 🔹 Encoder / decoder
+# -------------------------------------------------
+
+def encode_sensor_readings(readings):
+    """
+    SensorReading.to_dict() rows -> compact JSON-serializable envelope.
+    """
+
+    count = len(readings)
+    out = bytearray(struct.pack("<I", count))
+
+    _write_varints(_deltas([r["id"] for r in readings]), out)
+    _write_varints(_deltas([_to_micros(r["created_at"]) for r in readings]), out)
+
+    for field in FLOAT_FIELDS:
+        out += _float_bytes([r[field] for r in readings])
+
+    out += _float_bytes([
+        float("nan") if r.get("health_score") is None else r["health_score"]
+        for r in readings
+    ])
+
+    bits = bytearray((count + 7) // 8)
+    for i, r in enumerate(readings):
+        if r.get("anomaly_detected"):
+            bits[i >> 3] |= 1 << (i & 7)
+    out += bits
+
+    # predicted_disease: dictionary index 0 = None
+    labels = [None]
+    label_index = {None: 0}
+    indexes = []
+
+    for r in readings:
+        label = r.get("predicted_disease")
+        if label not in label_index:
+            label_index[label] = len(labels)
+            labels.append(label)
+        indexes.append(label_index[label])
+
+    _write_varints(indexes, out)
+
+    for r in readings:
+        out += bytes.fromhex(r["data_hash"])
+
+    return {
+        "format": FORMAT,
+        "count": count,
+        "batch_id": readings[0]["batch_id"] if readings else None,
+        "labels": labels[1:],
+        "encoding": "zlib+base64",
+        "data": base64.b64encode(zlib.compress(bytes(out), 9)).decode("ascii")
+    }
+
+
+def decode_sensor_readings(encoded):
+    """
+    Envelope from encode_sensor_readings() -> list of reading dicts.
+    """
+
+    if encoded.get("format") != FORMAT:
+        raise ValueError(f"Unsupported sensor encoding: {encoded.get('format')}")
+
+    buf = zlib.decompress(base64.b64decode(encoded["data"]))
+    (count,) = struct.unpack_from("<I", buf, 0)
+    pos = 4
+
+    id_deltas, pos = _read_varints(buf, pos, count)
+    time_deltas, pos = _read_varints(buf, pos, count)
+
+    columns = {}
+    for field in FLOAT_FIELDS + ("health_score",):
+        columns[field], pos = _floats_from(buf, pos, count)
+
+    bits = buf[pos:pos + (count + 7) // 8]
+    pos += len(bits)
+
+    label_indexes, pos = _read_varints(buf, pos, count)
+    labels = [None] + list(encoded.get("labels", []))
+
+    hashes = [buf[pos + i * 32:pos + (i + 1) * 32].hex() for i in range(count)]
+
+    ids = list(itertools.accumulate(id_deltas))
+    micros = list(itertools.accumulate(time_deltas))
+    batch_id = encoded.get("batch_id")
+
+    readings = []
+    for i in range(count):
+        health_score = columns["health_score"][i]
+
+        readings.append({
+            "id": ids[i],
+            "batch_id": batch_id,
+            "temperature": columns["temperature"][i],
+            "humidity": columns["humidity"][i],
+            "nitrogen": columns["nitrogen"][i],
+            "phosphorus": columns["phosphorus"][i],
+            "potassium": columns["potassium"][i],
+            "anomaly_detected": bool(bits[i >> 3] >> (i & 7) & 1),
+            "predicted_disease": labels[label_indexes[i]],
+            "health_score": None if health_score != health_score else health_score,
+            "data_hash": hashes[i],
+            "created_at": (_EPOCH + timedelta(microseconds=micros[i])).isoformat()
+        })
+
+    return readings
+
+
+def pack_sensor_readings(readings, encoding="json"):
+    """
+    Value for metadata["sensor_readings"] (IPFS_SENSOR_ENCODING).
+    """
+
+    if encoding == "columnar":
+        return encode_sensor_readings(readings)
+
+    return readings
+
+
+# -------------------------------------------------
+# 🔹 Integrity check (rebuild data_hash)
+# -------------------------------------------------
+
+def _device_variants(value):
+    # Devices may send 40 or 40.0; both are stored as 40.0
+    if value.is_integer():
+        return (int(value), value)
+
+    return (value,)
+
+
+def rebuild_reading_hash(reading):
+    """
+    data_hash of the raw device payload behind a stored reading, or None
+    if no int/float combination reproduces it (e.g. string payloads).
+    """
+
+    variants = [_device_variants(float(reading[column])) for _, column in DEVICE_FIELDS]
+    keys = [key for key, _ in DEVICE_FIELDS]
+
+    for values in itertools.product(*variants):
+        data_hash = hash_sensor_reading(dict(zip(keys, values)))
+
+        if data_hash == reading["data_hash"]:
+            return data_hash
+
+    return None
+
+
+def verify_sensor_readings(readings):
+    """
+    Check every reading (decoded or to_dict() rows) against its data_hash.
+    """
+
+    if isinstance(readings, dict):
+        readings = decode_sensor_readings(readings)
+
+    failed = [r["id"] for r in readings if rebuild_reading_hash(r) is None]
+
+    return {
+        "total": len(readings),
+        "verified": len(readings) - len(failed),
+        "failed_ids": failed
+    }